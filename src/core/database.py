@@ -27,6 +27,11 @@ class DatabaseManager:
         try:
             self.conn = sqlite3.connect(self.db_path)
             self.conn.row_factory = sqlite3.Row
+            # WAL lets reader connections on other threads run alongside a writer.
+            self.conn.execute("PRAGMA journal_mode=WAL;")
+            self.conn.execute("PRAGMA synchronous=NORMAL;")
+            self.conn.execute("PRAGMA busy_timeout=5000;")
+            self.conn.execute("PRAGMA temp_store=MEMORY;")
             # Auto-migrate schema on connection
             self._migrate_schema()
         except sqlite3.Error as e:
@@ -410,6 +415,21 @@ class DatabaseManager:
 
         return projects
 
+    def max_last_updated(self) -> Optional[str]:
+        """Get the most recent last_updated timestamp across all projects (ISO string)."""
+        sql = "SELECT MAX(last_updated) AS max_updated FROM projects;"
+        row = self._execute_query(sql, fetch_one=True)
+        return row['max_updated'] if row else None
+
+    def count_projects(self, enabled_only: bool = True) -> int:
+        """Count projects, using the same filter as get_all_projects."""
+        if enabled_only:
+            sql = "SELECT COUNT(*) AS n FROM projects WHERE enabled = 1 AND archived = 0;"
+        else:
+            sql = "SELECT COUNT(*) AS n FROM projects;"
+        row = self._execute_query(sql, fetch_one=True)
+        return row['n'] if row else 0
+
     # Backward-compatibility helpers (older CLI layers used these names)
     def get_all_enabled_projects(self) -> List[Dict[str, Any]]:
         """Fetch all enabled projects (backward compatible alias)."""
@@ -526,8 +546,8 @@ class DatabaseManager:
         for field, value in fields.items():
             if field in allowed_fields:
                 if field == 'tags':
-                    # Serialize tags as JSON
-                    value = json.dumps(value) if isinstance(value, list) else value
+                    # Serialize tags as JSON (the tag editor hands over a tuple snapshot)
+                    value = json.dumps(list(value)) if isinstance(value, (list, tuple)) else value
                 updates.append(f"{field} = ?")
                 params.append(value)
 
@@ -0,0 +1,320 @@
+"""Native Windows helpers for deleting directories held open by other processes."""
+
+import ctypes
+import os
+import shutil
+import signal
+import stat
+import subprocess
+import sys
+from typing import Callable, Iterable, List, Optional
+
+
+# Restart Manager constants (RestartManager.h)
+CCH_RM_SESSION_KEY = 32
+CCH_RM_MAX_APP_NAME = 255
+CCH_RM_MAX_SVC_NAME = 63
+ERROR_SUCCESS = 0
+ERROR_MORE_DATA = 234
+
+# ShellExecuteExW / wait constants
+SEE_MASK_NOCLOSEPROCESS = 0x00000040
+SEE_MASK_NOASYNC = 0x00000100
+SW_HIDE = 0
+WAIT_OBJECT_0 = 0
+
+# SHFileOperationW constants
+FO_DELETE = 0x0003
+FOF_NO_UI = 0x0614  # FOF_SILENT | FOF_NOCONFIRMATION | FOF_NOERRORUI | FOF_NOCONFIRMMKDIR
+
+if sys.platform.startswith("win"):
+    from ctypes import wintypes
+
+    class _RM_UNIQUE_PROCESS(ctypes.Structure):
+        _fields_ = [
+            ("dwProcessId", wintypes.DWORD),
+            ("ProcessStartTime", wintypes.FILETIME),
+        ]
+
+    class _RM_PROCESS_INFO(ctypes.Structure):
+        _fields_ = [
+            ("Process", _RM_UNIQUE_PROCESS),
+            ("strAppName", wintypes.WCHAR * (CCH_RM_MAX_APP_NAME + 1)),
+            ("strServiceShortName", wintypes.WCHAR * (CCH_RM_MAX_SVC_NAME + 1)),
+            ("ApplicationType", ctypes.c_int),
+            ("AppStatus", wintypes.ULONG),
+            ("TSSessionId", wintypes.DWORD),
+            ("bRestartable", wintypes.BOOL),
+        ]
+
+    class _SHFILEOPSTRUCTW(ctypes.Structure):
+        _fields_ = [
+            ("hwnd", wintypes.HWND),
+            ("wFunc", wintypes.UINT),
+            ("pFrom", wintypes.LPCWSTR),
+            ("pTo", wintypes.LPCWSTR),
+            ("fFlags", wintypes.WORD),
+            ("fAnyOperationsAborted", wintypes.BOOL),
+            ("hNameMappings", ctypes.c_void_p),
+            ("lpszProgressTitle", wintypes.LPCWSTR),
+        ]
+
+    class _SHELLEXECUTEINFOW(ctypes.Structure):
+        _fields_ = [
+            ("cbSize", wintypes.DWORD),
+            ("fMask", wintypes.ULONG),
+            ("hwnd", wintypes.HWND),
+            ("lpVerb", wintypes.LPCWSTR),
+            ("lpFile", wintypes.LPCWSTR),
+            ("lpParameters", wintypes.LPCWSTR),
+            ("lpDirectory", wintypes.LPCWSTR),
+            ("nShow", ctypes.c_int),
+            ("hInstApp", wintypes.HINSTANCE),
+            ("lpIDList", ctypes.c_void_p),
+            ("lpClass", wintypes.LPCWSTR),
+            ("hkeyClass", wintypes.HKEY),
+            ("dwHotKey", wintypes.DWORD),
+            ("hIconOrMonitor", wintypes.HANDLE),
+            ("hProcess", wintypes.HANDLE),
+        ]
+
+
+class FileLockService:
+    """Service for finding and releasing file locks via the Windows Restart Manager API."""
+
+    @staticmethod
+    def is_supported() -> bool:
+        return sys.platform.startswith("win")
+
+    @staticmethod
+    def find_locking_pids(paths: Iterable[str]) -> Optional[List[int]]:
+        """
+        Find processes holding any of the given files open.
+
+        Args:
+            paths: File paths to check
+
+        Returns:
+            List of PIDs (possibly empty), or None if the Restart Manager is unavailable
+            or the session could not be started.
+        """
+        if not FileLockService.is_supported():
+            return None
+
+        try:
+            rstrtmgr = ctypes.WinDLL("Rstrtmgr")
+        except OSError:
+            return None
+
+        session = wintypes.DWORD(0)
+        session_key = ctypes.create_unicode_buffer(CCH_RM_SESSION_KEY + 1)
+        if rstrtmgr.RmStartSession(ctypes.byref(session), 0, session_key) != ERROR_SUCCESS:
+            return None
+
+        try:
+            files = [str(p) for p in paths]
+            if not files:
+                return []
+
+            file_array = (wintypes.LPCWSTR * len(files))(*files)
+            if rstrtmgr.RmRegisterResources(session, len(files), file_array, 0, None, 0, None) != ERROR_SUCCESS:
+                return None
+
+            needed = wintypes.UINT(0)
+            count = wintypes.UINT(0)
+            reasons = wintypes.DWORD(0)
+            infos = None
+            while True:
+                infos = (_RM_PROCESS_INFO * count.value)() if count.value else None
+                rc = rstrtmgr.RmGetList(
+                    session, ctypes.byref(needed), ctypes.byref(count), infos, ctypes.byref(reasons)
+                )
+                if rc == ERROR_MORE_DATA:
+                    count.value = needed.value
+                    continue
+                if rc != ERROR_SUCCESS:
+                    return None
+                break
+
+            if not infos:
+                return []
+            return sorted({infos[i].Process.dwProcessId for i in range(count.value)})
+        finally:
+            rstrtmgr.RmEndSession(session)
+
+    @staticmethod
+    def is_admin() -> bool:
+        """True if the current process is elevated (always False off Windows)."""
+        if not FileLockService.is_supported():
+            return False
+        try:
+            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+        except (AttributeError, OSError):
+            return False
+
+    @staticmethod
+    def run_elevated(executable: str, args: List[str], timeout: float) -> Optional[int]:
+        """
+        Run a program elevated via ShellExecuteExW("runas") and wait for it.
+
+        Args:
+            executable: Program to launch
+            args: Command-line arguments (quoted with Windows rules)
+            timeout: Seconds to wait for the process
+
+        Returns:
+            Process exit code, or None if it could not be launched (e.g. UAC was declined).
+
+        Raises:
+            subprocess.TimeoutExpired: If the process did not exit within timeout.
+        """
+        if not FileLockService.is_supported():
+            return None
+
+        shell32 = ctypes.WinDLL("shell32", use_last_error=True)
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        shell32.ShellExecuteExW.argtypes = [ctypes.POINTER(_SHELLEXECUTEINFOW)]
+        shell32.ShellExecuteExW.restype = wintypes.BOOL
+        kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        kernel32.WaitForSingleObject.restype = wintypes.DWORD
+        kernel32.GetExitCodeProcess.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+        kernel32.GetExitCodeProcess.restype = wintypes.BOOL
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+        sei = _SHELLEXECUTEINFOW()
+        sei.cbSize = ctypes.sizeof(sei)
+        sei.fMask = SEE_MASK_NOCLOSEPROCESS | SEE_MASK_NOASYNC
+        sei.lpVerb = "runas"
+        sei.lpFile = executable
+        sei.lpParameters = subprocess.list2cmdline(args)
+        sei.nShow = SW_HIDE
+
+        if not shell32.ShellExecuteExW(ctypes.byref(sei)) or not sei.hProcess:
+            return None
+
+        try:
+            if kernel32.WaitForSingleObject(sei.hProcess, int(timeout * 1000)) != WAIT_OBJECT_0:
+                raise subprocess.TimeoutExpired([executable, *args], timeout)
+            exit_code = wintypes.DWORD(0)
+            if not kernel32.GetExitCodeProcess(sei.hProcess, ctypes.byref(exit_code)):
+                return None
+            return exit_code.value
+        finally:
+            kernel32.CloseHandle(sei.hProcess)
+
+    @staticmethod
+    def shell_delete(path: str) -> bool:
+        """
+        Delete a directory tree in-process with SHFileOperationW (no UI, not to the Recycle Bin).
+
+        Returns:
+            True if the tree is gone afterwards, False on failure or off Windows.
+        """
+        if not FileLockService.is_supported():
+            return False
+
+        shell32 = ctypes.WinDLL("shell32", use_last_error=True)
+        shell32.SHFileOperationW.argtypes = [ctypes.POINTER(_SHFILEOPSTRUCTW)]
+        shell32.SHFileOperationW.restype = ctypes.c_int
+
+        op = _SHFILEOPSTRUCTW()
+        op.wFunc = FO_DELETE
+        # pFrom is a double-NUL-terminated list of absolute paths (the \\?\ prefix is not supported).
+        op.pFrom = os.path.abspath(path) + "\0"
+        op.fFlags = FOF_NO_UI
+
+        rc = shell32.SHFileOperationW(ctypes.byref(op))
+        return rc == 0 and not op.fAnyOperationsAborted and not os.path.exists(path)
+
+    @staticmethod
+    def terminate_processes(pids: Iterable[int]) -> None:
+        """Terminate the given processes, never the current one. Errors are ignored."""
+        my_pid = os.getpid()
+        for pid in pids:
+            if pid == my_pid:
+                continue
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+    @staticmethod
+    def force_rmtree(path: str) -> None:
+        """Delete a directory tree, clearing read-only attributes and retrying on failure."""
+        def _on_error(func, failed_path, _exc):
+            os.chmod(failed_path, stat.S_IWRITE)
+            func(failed_path)
+
+        shutil.rmtree(path, onexc=_on_error)
+
+    @staticmethod
+    def release_and_delete(path: str) -> Optional[bool]:
+        """
+        Terminate processes locking files under path, then delete the tree.
+
+        Returns:
+            True if deleted, False if deletion failed, None if the Restart Manager
+            is unavailable (caller should fall back to another strategy).
+        """
+        files = [
+            os.path.join(root, name)
+            for root, _dirs, names in os.walk(path)
+            for name in names
+        ]
+        pids = FileLockService.find_locking_pids(files)
+        if pids is None:
+            return None
+
+        FileLockService.terminate_processes(pids)
+        try:
+            FileLockService.force_rmtree(path)
+        except OSError:
+            return False
+        return not os.path.exists(path)
+
+    @staticmethod
+    def delete_locked_tree(
+        path: str,
+        fallback: Optional[Callable[[], bool]] = None,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> bool:
+        """
+        Delete a directory tree, releasing file locks held by other processes if needed.
+
+        Tries a plain in-process delete first. Only if that fails with a sharing violation
+        or access denied are locking processes found with the Restart Manager, terminated,
+        and the delete retried. If that still fails, fallback (e.g. an elevated delete) runs.
+
+        Args:
+            path: Directory to delete
+            fallback: Last-resort delete, called when the native strategies fail
+            log: Optional progress callback
+
+        Returns:
+            True if the directory was deleted, False otherwise
+        """
+        def _log(message: str) -> None:
+            if log is not None:
+                log(message)
+
+        try:
+            FileLockService.force_rmtree(path)
+            return True
+        except FileNotFoundError:
+            # Already gone (or removed concurrently).
+            return not os.path.exists(path)
+        except OSError as e:
+            # ERROR_SHARING_VIOLATION (32) / ERROR_ACCESS_DENIED (5): something holds a handle.
+            if not isinstance(e, PermissionError) and getattr(e, "winerror", None) not in (32, 5):
+                _log(f"Error deleting directory: {e}")
+                return False
+
+        _log("Closing processes that hold files open and deleting directory...")
+        result = FileLockService.release_and_delete(path)
+        if result:
+            return True
+        if fallback is None:
+            return False
+        if result is False:
+            _log("Native delete failed; retrying with the fallback delete...")
+        return fallback()
@@ -2,6 +2,7 @@
 
 import json
 import logging
+import os
 from datetime import datetime
 from typing import Dict, Any, Optional, Tuple, List
 
@@ -108,48 +109,133 @@ class ProjectManager:
             self.logger.error(colored(f"Error creating project data payload: {str(e)}", "red"))
             raise ProjectManagerError(f"Failed to create project data payload: {str(e)}")
 
+    # Patch the existing projects.json in place when fewer than this fraction of entries changed
+    INCREMENTAL_REGEN_THRESHOLD = 0.10
+
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[float]:
+        """Convert an ISO timestamp from the DB to epoch seconds (None if unparseable)."""
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(str(value)).timestamp()
+        except ValueError:
+            return None
+
+    def _load_existing_entries(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Load the current projects.json indexed by project_uuid.
+
+        Returns None when the file is missing, unreadable, or was not written by us
+        (entries without project_uuid), in which case a full rebuild is required.
+        """
+        try:
+            with open(Config.PROJECTS_FILE, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        if not isinstance(existing, list):
+            return None
+
+        index: Dict[str, Dict[str, Any]] = {}
+        for entry in existing:
+            if not isinstance(entry, dict) or not entry.get("project_uuid"):
+                return None
+            index[entry["project_uuid"]] = entry
+        return index
+
+    def _build_cursor_entry(self, proj_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a DB project row to a Cursor projects.json entry."""
+        # Tags may already be a list (core DatabaseManager parses JSON), or a JSON string in older DB layers.
+        tags_value = proj_dict.get("tags") or []
+        if isinstance(tags_value, str):
+            try:
+                db_tags = json.loads(tags_value)
+            except json.JSONDecodeError:
+                db_tags = []
+                self.logger.warning(
+                    f"Could not parse tags JSON from DB for {proj_dict.get('uuid')}: {tags_value}"
+                )
+        else:
+            db_tags = tags_value
+
+        entry = ProjectEntry(
+            name=proj_dict['name'],
+            rootPath=proj_dict['root_path'],
+            paths=[],  # Default, as per original model
+            tags=db_tags, # This should be a list now
+            enabled=bool(proj_dict['enabled']),
+            project_uuid=proj_dict['uuid']
+        )
+        return entry.model_dump(exclude_none=True)
+
     def regenerate_cursor_projects_json(self, db_manager) -> None: # Add type hint for db_manager later
-        """Generate projects.json from SQLite data."""
+        """Generate projects.json from SQLite data.
+
+        Skips the write entirely when the file is newer than the latest DB change and holds one
+        entry per enabled project, and patches only the changed entries when few projects were
+        updated since the last write.
+        """
         try:
             self.logger.info(colored("Regenerating projects.json for Cursor Project Manager...", "cyan"))
+
+            file_mtime: Optional[float] = None
+            try:
+                file_mtime = os.stat(Config.PROJECTS_FILE).st_mtime
+            except OSError:
+                pass
+
+            existing_index = self._load_existing_entries() if file_mtime is not None else None
+
+            if (
+                existing_index is not None
+                and hasattr(db_manager, "max_last_updated")
+                and hasattr(db_manager, "count_projects")
+            ):
+                max_updated = self._parse_timestamp(db_manager.max_last_updated())
+                # A hard delete leaves MAX(last_updated) unchanged, so the entry count must match too.
+                if (
+                    max_updated is not None
+                    and file_mtime >= max_updated
+                    and len(existing_index) == db_manager.count_projects(enabled_only=True)
+                ):
+                    self.logger.info(colored(f"✓ {Config.PROJECTS_FILE} is up-to-date", "green"))
+                    return
+
             # Core DatabaseManager exposes get_all_projects(enabled_only=True). Keep logic here resilient
             # in case db_manager is an older/newer implementation.
             if hasattr(db_manager, "get_all_projects"):
                 projects_data = db_manager.get_all_projects(enabled_only=True)
             else:
                 projects_data = db_manager.get_all_enabled_projects()
-            
+
+            changed_uuids = set()
+            if existing_index is not None:
+                for proj_dict in projects_data:
+                    updated = self._parse_timestamp(proj_dict.get('last_updated'))
+                    if proj_dict['uuid'] not in existing_index or updated is None or updated > file_mtime:
+                        changed_uuids.add(proj_dict['uuid'])
+                if len(changed_uuids) >= max(1, len(projects_data) * self.INCREMENTAL_REGEN_THRESHOLD):
+                    existing_index = None
+
             cursor_project_entries = []
             for proj_dict in projects_data:
-                # Map DB data to ProjectEntry Pydantic model
-                # Tags may already be a list (core DatabaseManager parses JSON), or a JSON string in older DB layers.
-                tags_value = proj_dict.get("tags") or []
-                if isinstance(tags_value, str):
-                    try:
-                        db_tags = json.loads(tags_value)
-                    except json.JSONDecodeError:
-                        db_tags = []
-                        self.logger.warning(
-                            f"Could not parse tags JSON from DB for {proj_dict.get('uuid')}: {tags_value}"
-                        )
+                if existing_index is not None and proj_dict['uuid'] not in changed_uuids:
+                    # Unchanged since last write: reuse the on-disk entry as-is
+                    cursor_project_entries.append(existing_index[proj_dict['uuid']])
                 else:
-                    db_tags = tags_value
-
-                entry = ProjectEntry(
-                    name=proj_dict['name'],
-                    rootPath=proj_dict['root_path'],
-                    paths=[],  # Default, as per original model
-                    tags=db_tags, # This should be a list now
-                    enabled=bool(proj_dict['enabled']),
-                    project_uuid=proj_dict['uuid']
-                )
-                cursor_project_entries.append(entry.model_dump(exclude_none=True)) # Changed .dict() to .model_dump()
+                    cursor_project_entries.append(self._build_cursor_entry(proj_dict))
 
             # Write updated content
             with open(Config.PROJECTS_FILE, 'w', encoding='utf-8') as f:
                 json.dump(cursor_project_entries, f, indent=4)
 
-            self.logger.info(colored(f"✓ Successfully regenerated {Config.PROJECTS_FILE}", "green"))
+            if existing_index is not None:
+                self.logger.info(colored(
+                    f"✓ Updated {len(changed_uuids)} changed entries in {Config.PROJECTS_FILE}", "green"
+                ))
+            else:
+                self.logger.info(colored(f"✓ Successfully regenerated {Config.PROJECTS_FILE}", "green"))
             
             # Validate the updated file
             with open(Config.PROJECTS_FILE, 'r', encoding='utf-8') as f:
@@ -4,8 +4,9 @@ import glob
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
 import pathspec
 from termcolor import colored
@@ -17,6 +18,9 @@ from core.models import ProjectInfo
 
 class ProjectContext:
     """Handles project context detection and information collection."""
+
+    # Concurrent readers used when collecting file samples
+    FILE_SAMPLE_WORKERS = 8
     
     def __init__(self, logger: logging.Logger):
         self.logger = logger
@@ -70,6 +74,18 @@ class ProjectContext:
         # Create PathSpec from patterns
         return pathspec.PathSpec.from_lines('gitwildmatch', patterns)
 
+    @staticmethod
+    def _read_file_sample(file_path: str, max_chars: int) -> Tuple[str, Optional[str], Optional[Exception]]:
+        """Read up to max_chars from a file. Returns (path, content, error)."""
+        try:
+            # Already size-checked during selection, but keep a defensive guard
+            if os.path.getsize(file_path) > 1_000_000:
+                return file_path, None, None
+            with open(file_path, 'r', encoding='utf-8', errors='ignore', buffering=65536) as f:
+                return file_path, f.read(max_chars), None
+        except Exception as e:
+            return file_path, None, e
+
     def get_file_samples(self) -> Optional[Dict[str, str]]:
         """Collects file samples from the repository for AI analysis."""
         try:
@@ -156,26 +172,30 @@ class ProjectContext:
                 self.logger.warning(colored("No suitable files found for AI analysis", "yellow"))
                 return None
                 
-            # Read content of selected files
+            # Read content of selected files concurrently (blocking I/O releases the GIL).
+            # The total-chars budget becomes best-effort since reads are submitted up front.
             file_samples = {}
             total_chars = 0
+            max_chars = Config.MAX_CONTENT_LENGTH
+            budget = max_chars * 3
             
-            for file_path in selected_files:
-                try:
-                    # Already size-checked above, but keep a defensive guard
-                    if os.path.getsize(file_path) > 1_000_000:
+            with ThreadPoolExecutor(max_workers=self.FILE_SAMPLE_WORKERS) as executor:
+                results = executor.map(
+                    lambda path: self._read_file_sample(path, max_chars),
+                    selected_files,
+                )
+                for file_path, content, error in results:
+                    if error is not None:
+                        self.logger.warning(colored(f"Warning: Could not read {file_path}: {str(error)}", "yellow"))
                         continue
-                        
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read(Config.MAX_CONTENT_LENGTH)
-                        file_samples[file_path] = content
-                        total_chars += len(content)
-                        
-                        # If we've collected enough content, stop
-                        if total_chars >= Config.MAX_CONTENT_LENGTH * 3:
-                            break
-                except Exception as e:
-                    self.logger.warning(colored(f"Warning: Could not read {file_path}: {str(e)}", "yellow"))
+                    if content is None:
+                        continue
+                    file_samples[file_path] = content
+                    total_chars += len(content)
+                    
+                    # If we've collected enough content, stop
+                    if total_chars >= budget:
+                        break
                     
             self.logger.info(colored(f"✓ Analyzed {len(file_samples)} files for AI tagging", "green"))
             return file_samples
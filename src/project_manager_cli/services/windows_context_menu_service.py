@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import functools
 import os
 import shutil
+import subprocess
 import sys
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+if sys.platform.startswith("win"):
+    import winreg  # type: ignore
+else:
+    winreg = None
+
+# Resolved once at import: Path.resolve() hits the filesystem on every call.
+_PYTHON_EXE = str(Path(sys.executable).resolve())
+
 
 @dataclass(frozen=True)
 class ContextMenuInstallResult:
@@ -16,6 +27,80 @@ class ContextMenuInstallResult:
     python_exe: str
 
 
+@functools.cache
+def _find_pwsh() -> str:
+    """
+    Prefer PowerShell 7 (pwsh). Fall back to Windows PowerShell if needed.
+    Returns an executable path or name that can be invoked.
+
+    Cached per process; see WindowsContextMenuService.invalidate_cache().
+    """
+    # PATH first, so a user-selected pwsh wins. Direct scan: only pwsh.exe is needed,
+    # so skip shutil.which's PATHEXT expansion.
+    for d in os.environ.get("PATH", "").split(os.pathsep):
+        if not d:
+            continue
+        p = os.path.join(d, "pwsh.exe")
+        if os.path.isfile(p):
+            return p
+
+    # Default install locations when pwsh is not on PATH.
+    for install in (
+        r"C:\Program Files\PowerShell\7\pwsh.exe",
+        r"C:\Program Files (x86)\PowerShell\7\pwsh.exe",
+    ):
+        if os.path.isfile(install):
+            return install
+
+    # Last resort: Windows PowerShell (still works for our pause behavior).
+    return "powershell.exe"
+
+
+# Environment variable (HKCU\Environment) holding the Python interpreter used by the menu entry.
+PYTHON_ENV_VAR = "PM_CLI_PYTHON"
+
+
+@functools.cache
+def _ps_script(python_exe: str) -> str:
+    """PowerShell script: run pm-cli, then pause for keypress."""
+    # Use python -m to avoid relying on pm-cli being on PATH.
+    return (
+        "& { "
+        "try { "
+        f"& '{python_exe}' -m project_manager_cli.cli run "
+        "} finally { "
+        "Write-Host ''; "
+        "Write-Host 'Press any key to close...'; "
+        "$null = $Host.UI.RawUI.ReadKey('NoEcho,IncludeKeyDown'); "
+        "} "
+        "}"
+    )
+
+
+@functools.cache
+def _cmd_template(pwsh_path: str) -> str:
+    """
+    Return the command string stored in the registry for Explorer, as a format string
+    with a `{start_dir}` field for the Explorer placeholder (%1 or %V).
+
+    Uses cmd.exe + start to open a NEW window with working directory set to the clicked folder.
+    The value is stored as REG_EXPAND_SZ: cmd.exe and the Python interpreter are referenced
+    through %SystemRoot% and %PM_CLI_PYTHON%, expanded by Explorer on invocation.
+    """
+    # Literal braces (PowerShell script blocks, unusual paths) must survive str.format.
+    ps_script = _ps_script(f"%{PYTHON_ENV_VAR}%").replace("{", "{{").replace("}", "}}")
+    pwsh_path = pwsh_path.replace("{", "{{").replace("}", "}}")
+
+    # cmd.exe string with quoting:
+    # - start "" sets window title
+    # - /D sets working directory
+    # - call pwsh and run -Command "<script>"
+    return (
+        f'%SystemRoot%\\System32\\cmd.exe /c start "" /D "{{start_dir}}" "{pwsh_path}" '
+        f'-NoLogo -NoProfile -ExecutionPolicy Bypass -Command "{ps_script}"'
+    )
+
+
 class WindowsContextMenuService:
     """
     Windows Explorer context menu integration (HKCU) for running pm-cli on a folder.
@@ -31,6 +116,15 @@ class WindowsContextMenuService:
     MENU_KEY_NAME = "pm-cli.run"
     MENU_LABEL = "Run Project Manager (pm-cli)"
 
+    def __init__(self) -> None:
+        # Per-process cache of is_installed(); updated by install()/uninstall().
+        self._installed_cache: Optional[bool] = None
+
+    def invalidate_cache(self) -> None:
+        """Drop cached registry/filesystem lookups (is_installed, pwsh location)."""
+        self._installed_cache = None
+        _find_pwsh.cache_clear()
+
     def is_supported(self) -> bool:
         return sys.platform.startswith("win")
 
@@ -43,48 +137,52 @@ class WindowsContextMenuService:
                 python_exe="",
             )
 
-        pwsh_path = self._find_pwsh()
-        python_exe = str(Path(sys.executable).resolve())
+        pwsh_path = _find_pwsh()
+        python_exe = _PYTHON_EXE
 
-        # Build the commands for both kinds of shell entries.
-        cmd_for_folder_item = self._build_registry_command(
-            pwsh_path=pwsh_path,
-            python_exe=python_exe,
-            start_dir_placeholder="%1",
-        )
-        cmd_for_background = self._build_registry_command(
-            pwsh_path=pwsh_path,
-            python_exe=python_exe,
-            start_dir_placeholder="%V",
-        )
+        # Build the commands for both kinds of shell entries; only the start-dir token differs.
+        cmd_template = _cmd_template(pwsh_path)
+        cmd_for_folder_item = cmd_template.format_map({"start_dir": "%1"})
+        cmd_for_background = cmd_template.format_map({"start_dir": "%V"})
 
-        try:
-            import winreg  # type: ignore
-        except Exception as e:  # pragma: no cover
+        if winreg is None:  # pragma: no cover
             return ContextMenuInstallResult(
                 installed=False,
-                message=f"Failed to import winreg; cannot install context menu. Error: {e}",
+                message="winreg is unavailable; cannot install context menu.",
                 pwsh_path=pwsh_path,
                 python_exe=python_exe,
             )
 
+        # The menu command resolves Python through %PM_CLI_PYTHON%, so a Python upgrade only
+        # needs this variable rewritten, not the menu keys.
+        if self._set_python_env(winreg, python_exe):
+            self._broadcast_environment_change()
+
         base_dir = r"Software\Classes\Directory\shell"
         base_bg = r"Software\Classes\Directory\Background\shell"
 
-        # Create keys under HKCU (no admin).
-        self._write_menu_key(
-            winreg=winreg,
-            base=base_dir,
-            command=cmd_for_folder_item,
-            force=force,
-        )
-        self._write_menu_key(
-            winreg=winreg,
-            base=base_bg,
-            command=cmd_for_background,
-            force=force,
-        )
-
+        entries = [(base_dir, cmd_for_folder_item), (base_bg, cmd_for_background)]
+        if not force:
+            # Leave existing entries as-is.
+            entries = [(base, cmd) for base, cmd in entries if not self._command_key_exists(winreg, base)]
+        else:
+            # Skip the write entirely for entries whose stored values already match.
+            entries = [
+                (base, cmd) for base, cmd in entries
+                if not self._menu_key_matches(winreg, base, cmd, python_exe)
+            ]
+
+        # Create keys under HKCU (no admin): one batched `reg import`, falling back to per-key winreg writes.
+        if entries and not self._import_reg_file(entries=entries, icon=python_exe):
+            for base, command in entries:
+                self._write_menu_key(
+                    winreg=winreg,
+                    base=base,
+                    command=command,
+                    force=True,
+                )
+
+        self._installed_cache = True
         return ContextMenuInstallResult(
             installed=True,
             message=(
@@ -96,11 +194,7 @@ class WindowsContextMenuService:
         )
 
     def uninstall(self) -> bool:
-        if not self.is_supported():
-            return False
-        try:
-            import winreg  # type: ignore
-        except Exception:
+        if not self.is_supported() or winreg is None:
             return False
 
         removed_any = False
@@ -110,81 +204,109 @@ class WindowsContextMenuService:
         ):
             key_path = base + "\\" + self.MENU_KEY_NAME
             removed_any = self._delete_tree(winreg, winreg.HKEY_CURRENT_USER, key_path) or removed_any
+        # install() also set a user-wide environment variable; don't leave it behind.
+        if self._remove_python_env(winreg):
+            self._broadcast_environment_change()
+            removed_any = True
+        self._installed_cache = False
         return removed_any
 
     def is_installed(self) -> bool:
-        if not self.is_supported():
-            return False
-        try:
-            import winreg  # type: ignore
-        except Exception:
+        if self._installed_cache is None:
+            self._installed_cache = self._query_installed()
+        return self._installed_cache
+
+    def _query_installed(self) -> bool:
+        if not self.is_supported() or winreg is None:
             return False
 
         for base in (
             r"Software\Classes\Directory\shell",
             r"Software\Classes\Directory\Background\shell",
         ):
-            key_path = base + "\\" + self.MENU_KEY_NAME
             try:
-                with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path):
-                    return True
+                base_key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, base, 0, winreg.KEY_READ)
             except FileNotFoundError:
                 continue
+            # Relative open from the already-open shell key; both handles always closed.
+            with base_key:
+                try:
+                    with winreg.OpenKey(base_key, self.MENU_KEY_NAME, 0, winreg.KEY_READ):
+                        return True
+                except FileNotFoundError:
+                    continue
         return False
 
     # -------------------------
     # Internals
     # -------------------------
 
-    def _find_pwsh(self) -> str:
+    def _command_key_exists(self, winreg, base: str) -> bool:
+        command_key_path = base + "\\" + self.MENU_KEY_NAME + "\\command"
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, command_key_path):
+                return True
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _reg_escape(value: str) -> str:
+        """Escape a string for use as a quoted value in a .reg file."""
+        return value.replace("\\", "\\\\").replace('"', '\\"')
+
+    @staticmethod
+    def _reg_expand_sz(value: str) -> str:
+        """Encode a REG_EXPAND_SZ value for a .reg file (hex(2): UTF-16LE, NUL-terminated)."""
+        return "hex(2):" + ",".join(f"{b:02x}" for b in (value + "\0").encode("utf-16-le"))
+
+    def _render_reg_file(self, *, entries: list[tuple[str, str]], icon: str) -> str:
         """
-        Prefer PowerShell 7 (pwsh). Fall back to Windows PowerShell if needed.
-        Returns an executable path or name that can be invoked.
+        Render a .reg file writing every (base, command) entry in one import:
+          [HKEY_CURRENT_USER\\<base>\\<MENU_KEY_NAME>]  (Default) + Icon
+          [HKEY_CURRENT_USER\\<base>\\<MENU_KEY_NAME>\\command]  (Default)
         """
-        which = shutil.which("pwsh")
-        if which:
-            return which
-
-        candidates = [
-            r"C:\Program Files\PowerShell\7\pwsh.exe",
-            r"C:\Program Files (x86)\PowerShell\7\pwsh.exe",
-        ]
-        for c in candidates:
-            if Path(c).exists():
-                return c
-
-        # Last resort: Windows PowerShell (still works for our pause behavior).
-        return "powershell.exe"
-
-    def _build_registry_command(self, *, pwsh_path: str, python_exe: str, start_dir_placeholder: str) -> str:
+        lines = ["Windows Registry Editor Version 5.00", ""]
+        for base, command in entries:
+            menu_key_path = "HKEY_CURRENT_USER\\" + base + "\\" + self.MENU_KEY_NAME
+            lines += [
+                f"[{menu_key_path}]",
+                f'@="{self._reg_escape(self.MENU_LABEL)}"',
+                f'"Icon"="{self._reg_escape(icon)}"',
+                "",
+                f"[{menu_key_path}\\command]",
+                f"@={self._reg_expand_sz(command)}",
+                "",
+            ]
+        return "\r\n".join(lines) + "\r\n"
+
+    def _import_reg_file(self, *, entries: list[tuple[str, str]], icon: str) -> bool:
         """
-        Return the command string stored in the registry for Explorer.
-
-        Uses cmd.exe + start to open a NEW window with working directory set to the clicked folder.
+        Apply all entries with a single `reg.exe import`. Returns False if reg.exe is
+        unavailable or the import failed, so the caller can fall back to winreg.
         """
-        # PowerShell script: run pm-cli, then pause for keypress.
-        # Use python -m to avoid relying on pm-cli being on PATH.
-        ps_script = (
-            "& { "
-            "try { "
-            f"& '{python_exe}' -m project_manager_cli.cli run "
-            "} finally { "
-            "Write-Host ''; "
-            "Write-Host 'Press any key to close...'; "
-            "$null = $Host.UI.RawUI.ReadKey('NoEcho,IncludeKeyDown'); "
-            "} "
-            "}"
-        )
+        reg_exe = shutil.which("reg")
+        if not reg_exe:
+            return False
 
-        # cmd.exe string with quoting:
-        # - start "" sets window title
-        # - /D sets working directory
-        # - call pwsh and run -Command "<script>"
-        cmd = (
-            f'cmd.exe /c start "" /D "{start_dir_placeholder}" "{pwsh_path}" '
-            f'-NoLogo -NoProfile -ExecutionPolicy Bypass -Command "{ps_script}"'
-        )
-        return cmd
+        content = self._render_reg_file(entries=entries, icon=icon)
+        fd, reg_path = tempfile.mkstemp(suffix=".reg", prefix="pm-cli-")
+        try:
+            # reg.exe expects UTF-16 with BOM for Unicode .reg files.
+            with os.fdopen(fd, "w", encoding="utf-16", newline="") as f:
+                f.write(content)
+            result = subprocess.run(
+                [reg_exe, "import", reg_path],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            return result.returncode == 0
+        except OSError:
+            return False
+        finally:
+            try:
+                os.unlink(reg_path)
+            except OSError:
+                pass
 
     def _write_menu_key(self, *, winreg, base: str, command: str, force: bool) -> None:
         """
@@ -205,33 +327,110 @@ class WindowsContextMenuService:
             except FileNotFoundError:
                 pass
 
-        with winreg.CreateKeyEx(root, menu_key_path, 0, winreg.KEY_SET_VALUE) as k:
-            winreg.SetValueEx(k, "", 0, winreg.REG_SZ, self.MENU_LABEL)
-            winreg.SetValueEx(k, "Icon", 0, winreg.REG_SZ, str(Path(sys.executable).resolve()))
+        # One handle per subtree: the command subkey is created relative to the menu key.
+        access = winreg.KEY_SET_VALUE | winreg.KEY_QUERY_VALUE
+        with winreg.CreateKeyEx(root, menu_key_path, 0, access) as k:
+            self._set_value_if_changed(winreg, k, "", self.MENU_LABEL)
+            self._set_value_if_changed(winreg, k, "Icon", _PYTHON_EXE)
 
-        with winreg.CreateKeyEx(root, command_key_path, 0, winreg.KEY_SET_VALUE) as k:
-            winreg.SetValueEx(k, "", 0, winreg.REG_SZ, command)
+            with winreg.CreateKeyEx(k, "command", 0, access) as ck:
+                self._set_value_if_changed(winreg, ck, "", command, winreg.REG_EXPAND_SZ)
 
-    def _delete_tree(self, winreg, root, sub_key: str) -> bool:
-        """
-        Recursively delete a registry tree. Returns True if anything was deleted.
-        """
+    @staticmethod
+    def _query_value(winreg, key, name: str) -> Optional[tuple[str, int]]:
+        """Return (raw value, type) or None if missing. REG_EXPAND_SZ is not expanded."""
         try:
-            with winreg.OpenKey(root, sub_key, 0, winreg.KEY_READ | winreg.KEY_WRITE) as k:
-                # Delete children first
-                while True:
-                    try:
-                        child = winreg.EnumKey(k, 0)
-                    except OSError:
-                        break
-                    self._delete_tree(winreg, root, sub_key + "\\" + child)
+            return winreg.QueryValueEx(key, name)
         except FileNotFoundError:
-            return False
+            return None
+
+    def _set_value_if_changed(self, winreg, key, name: str, value: str, value_type: Optional[int] = None) -> bool:
+        """SetValueEx only when the stored string/type differs (avoids dirtying the hive)."""
+        if value_type is None:
+            value_type = winreg.REG_SZ
+        if self._query_value(winreg, key, name) != (value, value_type):
+            winreg.SetValueEx(key, name, 0, value_type, value)
+            return True
+        return False
+
+    def _set_python_env(self, winreg, python_exe: str) -> bool:
+        """Write HKCU\\Environment\\PM_CLI_PYTHON. Returns True if the value changed."""
+        access = winreg.KEY_SET_VALUE | winreg.KEY_QUERY_VALUE
+        with winreg.CreateKeyEx(winreg.HKEY_CURRENT_USER, "Environment", 0, access) as k:
+            return self._set_value_if_changed(winreg, k, PYTHON_ENV_VAR, python_exe, winreg.REG_EXPAND_SZ)
 
+    @staticmethod
+    def _remove_python_env(winreg) -> bool:
+        """Delete HKCU\\Environment\\PM_CLI_PYTHON. Returns True if it existed."""
         try:
-            winreg.DeleteKey(root, sub_key)
-            return True
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, "Environment", 0, winreg.KEY_SET_VALUE) as k:
+                winreg.DeleteValue(k, PYTHON_ENV_VAR)
         except FileNotFoundError:
             return False
+        return True
+
+    @staticmethod
+    def _broadcast_environment_change() -> None:
+        """Notify Explorer (WM_SETTINGCHANGE) so it picks up the environment variable change."""
+        try:
+            import ctypes
+
+            HWND_BROADCAST = 0xFFFF
+            WM_SETTINGCHANGE = 0x001A
+            SMTO_ABORTIFHUNG = 0x0002
+            result = ctypes.c_ulong()
+            ctypes.windll.user32.SendMessageTimeoutW(
+                HWND_BROADCAST, WM_SETTINGCHANGE, 0, "Environment",
+                SMTO_ABORTIFHUNG, 5000, ctypes.byref(result),
+            )
+        except Exception:
+            pass
 
+    def _menu_key_matches(self, winreg, base: str, command: str, icon: str) -> bool:
+        """True if the menu key under base already holds exactly these values."""
+        menu_key_path = base + "\\" + self.MENU_KEY_NAME
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, menu_key_path, 0, winreg.KEY_QUERY_VALUE) as k:
+                if self._query_value(winreg, k, "") != (self.MENU_LABEL, winreg.REG_SZ):
+                    return False
+                if self._query_value(winreg, k, "Icon") != (icon, winreg.REG_SZ):
+                    return False
+                with winreg.OpenKey(k, "command", 0, winreg.KEY_QUERY_VALUE) as ck:
+                    return self._query_value(winreg, ck, "") == (command, winreg.REG_EXPAND_SZ)
+        except OSError:
+            return False
 
+    def _delete_tree(self, winreg, root, sub_key: str) -> bool:
+        """
+        Delete a registry tree. Returns True if anything was deleted.
+
+        Walks the tree once (each key opened a single time, children enumerated by index),
+        then deletes leaf-first without reopening parents.
+        """
+        stack = [sub_key]
+        order: list[str] = []
+        while stack:
+            path = stack.pop()
+            try:
+                with winreg.OpenKey(root, path, 0, winreg.KEY_READ) as k:
+                    order.append(path)
+                    i = 0
+                    while True:
+                        try:
+                            child = winreg.EnumKey(k, i)
+                        except OSError:
+                            break
+                        stack.append(path + "\\" + child)
+                        i += 1
+            except FileNotFoundError:
+                continue
+
+        # Pre-order walk reversed => every child is deleted before its parent.
+        deleted_any = False
+        for path in reversed(order):
+            try:
+                winreg.DeleteKey(root, path)
+                deleted_any = True
+            except FileNotFoundError:
+                continue
+        return deleted_any
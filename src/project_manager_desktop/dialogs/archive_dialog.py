@@ -1,19 +1,303 @@
 """Archive project dialog with progress indicator."""
 
+import collections
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
-from PySide6 import QtWidgets
+from PySide6 import QtCore, QtWidgets
 
 from core.database import DatabaseManager
 from project_manager_cli.services.archive_service import ArchiveService
+from project_manager_cli.services.file_lock_service import FileLockService
 from project_manager_cli.services.git_service import GitService
 from ..theme import TOKENS
 
+# Matches the owning process in handle64.exe output lines ("... pid: 1234 type: File ...").
+_HANDLE_PID_RE = re.compile(r'\spid:\s+(\d+)\s')
+
+# Elevating force-delete script; the path is passed as a parameter, never interpolated.
+_DELETE_SCRIPT = Path(__file__).resolve().parent.parent / "resources" / "delete_locked_dir.ps1"
+
+# Recent git check results: project path -> (checked_at, .git mtime, is_repo, has_changes, status).
+_GIT_STATUS_CACHE: Dict[str, Tuple[float, Optional[float], bool, bool, str]] = {}
+_GIT_STATUS_TTL = 5.0
+
+
+def _find_handle_pids(path: str) -> Optional[List[int]]:
+    """
+    Run Sysinternals handle64.exe on path and parse owning PIDs in Python.
+
+    Returns:
+        Sorted PIDs (excluding this process), or None if handle64.exe is missing or
+        failed (it needs administrator rights to enumerate handles).
+    """
+    handle_exe = shutil.which("handle64.exe") or shutil.which("handle.exe")
+    if not handle_exe:
+        return None
+
+    try:
+        result = subprocess.run(
+            [handle_exe, "-accepteula", "-nobanner", path],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+
+    if result.returncode != 0:
+        return None
+
+    my_pid = os.getpid()
+    pids = {int(m.group(1)) for m in _HANDLE_PID_RE.finditer(result.stdout)}
+    pids.discard(my_pid)
+    return sorted(pids)
+
+
+def delete_with_elevated_powershell(path: str, log: Callable[[str], None]) -> bool:
+    """
+    Delete a directory tree using an elevated PowerShell process.
+
+    Returns:
+        True if successful, False otherwise
+    """
+    # Already elevated: try the native shell delete before starting PowerShell at all.
+    is_admin = FileLockService.is_admin()
+    if is_admin and FileLockService.shell_delete(path):
+        return True
+
+    # Locking PIDs are found up front in Python when possible; otherwise the elevated
+    # script enumerates them itself (handle64.exe needs administrator rights).
+    handle_pids = _find_handle_pids(path)
+    args = [
+        "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass",
+        "-File", str(_DELETE_SCRIPT), "-Path", path,
+    ]
+    if handle_pids is None:
+        args.append("-ScanHandles")
+    elif handle_pids:
+        args += ["-Pids", ",".join(str(pid) for pid in handle_pids)]
+
+    try:
+        if is_admin:
+            returncode = _run_streaming(["pwsh.exe", *args], timeout=180, log=log)
+        else:
+            # Elevate the script process directly; no intermediate PowerShell wrapper.
+            log("Requesting administrator rights to force-close handles and delete directory...")
+            returncode = FileLockService.run_elevated("pwsh.exe", args, timeout=180)
+            if returncode is None:
+                log("Elevation was declined or PowerShell could not be started.")
+                return False
+
+        if returncode != 0:
+            log(f"PowerShell exited with code {returncode}.")
+
+        return returncode == 0
+
+    except subprocess.TimeoutExpired:
+        log("Timed out while deleting directory.")
+        return False
+    except Exception as e:
+        log(f"Error deleting directory: {str(e)}")
+        return False
+
+
+def _run_streaming(cmd: List[str], timeout: float, log: Callable[[str], None]) -> int:
+    """
+    Run a command, forwarding each output line to the progress log as it arrives.
+
+    Returns:
+        Process exit code
+
+    Raises:
+        subprocess.TimeoutExpired: If the process was killed after timeout seconds.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+    killer = threading.Timer(timeout, proc.kill)
+    killer.start()
+    try:
+        for line in proc.stdout:
+            line = line.rstrip()
+            if line:
+                log(line)
+        returncode = proc.wait()
+    finally:
+        timed_out = not killer.is_alive()
+        killer.cancel()
+        proc.stdout.close()
+    if timed_out:
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return returncode
+
+
+class ArchiveWorkerSignals(QtCore.QObject):
+    """Signals for ArchiveWorker (QRunnable is not a QObject)."""
+
+    progress = QtCore.Signal(str)
+    percent = QtCore.Signal(int)
+    finished = QtCore.Signal(bool, str)
+
+
+class ArchiveWorker(QtCore.QRunnable):
+    """Runs the archive pipeline on the thread pool and reports back via signals."""
+
+    def __init__(
+        self,
+        db_path: str,
+        project_uuid: str,
+        project_path: str,
+        delete_original: bool
+    ):
+        super().__init__()
+        # The dialog reads archive_path/archive_size_mb after completion.
+        self.setAutoDelete(False)
+        self.signals = ArchiveWorkerSignals()
+        self.db_path = db_path
+        self.project_uuid = project_uuid
+        self.project_path = project_path
+        self.delete_original = delete_original
+
+        self.archive_path: Optional[str] = None
+        self.archive_size_mb: float = 0.0
+
+    def _log(self, message: str):
+        """Report a progress message to the dialog."""
+        self.signals.progress.emit(message)
+
+    def _delete_original_directory(self) -> bool:
+        """
+        Delete the original project directory, falling back to an elevated PowerShell delete.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return FileLockService.delete_locked_tree(
+            self.project_path,
+            fallback=lambda: delete_with_elevated_powershell(self.project_path, self._log),
+            log=self._log,
+        )
+
+    def run(self):
+        """Run the archive steps. Emits finished(success, error_message)."""
+        # SQLite connections are bound to the thread that created them, so the
+        # worker uses its own connection for the database update.
+        db = DatabaseManager(self.db_path)
+
+        try:
+            # Step 1: Delete library folders (25%)
+            self.signals.percent.emit(5)
+            self._log("\n=== Step 1: Deleting library folders ===")
+
+            deleted = ArchiveService.delete_library_folders(
+                self.project_path,
+                progress_callback=self._log
+            )
+
+            if deleted:
+                self._log(f"Deleted {len(deleted)} library folders")
+            else:
+                self._log("No library folders found to delete")
+
+            self.signals.percent.emit(25)
+
+            # Step 2: Create archive (50%)
+            self._log("\n=== Step 2: Creating ZIP archive ===")
+            archive_dir = ArchiveService.get_archive_directory()
+            project_dir_name = Path(self.project_path).name
+            archive_filename = ArchiveService.generate_archive_filename(
+                self.project_uuid,
+                project_dir_name
+            )
+            archive_path = archive_dir / archive_filename
+
+            self.signals.percent.emit(30)
+
+            success, archive_bytes = ArchiveService.create_zip_archive(
+                self.project_path,
+                archive_path,
+                progress_callback=self._log
+            )
+
+            if not success:
+                raise Exception("Failed to create archive")
+
+            self.signals.percent.emit(75)
+            self.archive_path = str(archive_path)
+            self.archive_size_mb = archive_bytes / (1024 * 1024)
+
+            # Step 3: Update database (100%)
+            self._log("\n=== Step 3: Updating database ===")
+            try:
+                # Use transaction to ensure database consistency
+                # NOTE: File operations (Steps 1-2) cannot be part of the SQLite transaction.
+                # The transaction only wraps the DB update to ensure atomicity of the
+                # database operation. If the DB update fails, we clean up the archive file
+                # to maintain consistency.
+                with db.transaction():
+                    db.archive_project(
+                        self.project_uuid,
+                        self.archive_path,
+                        self.archive_size_mb
+                    )
+            except Exception as db_error:
+                # If database update fails, clean up the archive file to prevent
+                # orphaned archives. This ensures we don't have ZIP files that aren't
+                # tracked in the database.
+                self._log(f"⚠ Database update failed: {db_error}")
+                self._log("Cleaning up archive file...")
+                if archive_path.exists():
+                    archive_path.unlink()
+                raise Exception(f"Database update failed: {db_error}")
+
+            self.signals.percent.emit(100)
+            self._log(f"\n✓ Archive complete: {archive_filename}")
+            self._log(f"✓ Archive size: {self.archive_size_mb:.2f} MB")
+            self._log(f"✓ Archive path: {self.archive_path}")
+
+            # Step 4 (optional): Delete original directory
+            if self.delete_original:
+                self._log("\n=== Step 4: Deleting original project directory ===")
+                self.signals.percent.emit(95)
+
+                deleted_ok = self._delete_original_directory()
+                if deleted_ok:
+                    self._log("✓ Original project directory deleted")
+                else:
+                    self._log("⚠ Failed to delete original directory (archive still created)")
+
+                self.signals.percent.emit(100)
+
+            success, error = True, ""
+
+        except Exception as e:
+            self._log(f"\n✗ Archive failed: {e}")
+            success, error = False, str(e)
+        finally:
+            db.close()
+
+        # Must be the last statement: the dialog drops its reference to this
+        # worker (setAutoDelete(False)) as soon as it handles finished.
+        self.signals.finished.emit(success, error)
+
 
 class ArchiveProjectDialog(QtWidgets.QDialog):
     """Dialog for archiving a project with progress feedback."""
 
+    # (is_git_repo, has_changes, status_output) from the background git check.
+    _git_ready = QtCore.Signal(bool, bool, str)
+
     def __init__(
         self,
         parent: QtWidgets.QWidget,
@@ -32,11 +316,20 @@ class ArchiveProjectDialog(QtWidgets.QDialog):
         self.archive_size_mb: float = 0.0
         self.success = False
 
+        self._worker: Optional[ArchiveWorker] = None
+
+        # Worker log lines are buffered and flushed to the text edit at most every 50 ms.
+        self._log_buf: collections.deque[str] = collections.deque()
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setInterval(50)
+        self._flush_timer.timeout.connect(self._flush_log)
+
         self.setWindowTitle("Archive Project")
         self.setModal(True)
         self.resize(600, 400)
 
         self._build_ui()
+        self._git_ready.connect(self._on_git_status, QtCore.Qt.ConnectionType.QueuedConnection)
         self._check_git_status()
 
     def _build_ui(self):
@@ -44,19 +337,31 @@ class ArchiveProjectDialog(QtWidgets.QDialog):
         layout = QtWidgets.QVBoxLayout(self)
         layout.setSpacing(12)
 
-        # Header
-        header = QtWidgets.QLabel(f"<h2>Archive Project: {self.project_name}</h2>")
+        # Header (plain text: no rich-text parse, and project names can't inject markup)
+        header = QtWidgets.QLabel()
+        header.setTextFormat(QtCore.Qt.TextFormat.PlainText)
+        header.setText(f"Archive Project: {self.project_name}")
+        header_font = header.font()
+        header_font.setPointSize(header_font.pointSize() + 4)
+        header_font.setBold(True)
+        header.setFont(header_font)
         layout.addWidget(header)
 
         # Warning message
+        warning_title = QtWidgets.QLabel("Warning:")
+        warning_title.setTextFormat(QtCore.Qt.TextFormat.PlainText)
+        warning_title.setStyleSheet(f"color: {TOKENS.warning}; font-weight: 600;")
+        layout.addWidget(warning_title)
+
         warning = QtWidgets.QLabel(
-            "<b>Warning:</b> This is a destructive operation that will:\n"
+            "This is a destructive operation that will:\n"
             "1. Check for uncommitted git changes (if git repo)\n"
             "2. Delete library folders (node_modules, venv, dist, build, etc.)\n"
             "3. Create a ZIP archive in %APPDATA%\\project-manager-cli\\archives\n"
             "4. Mark project as archived in database\n\n"
             "The project files will remain on disk but library folders will be deleted."
         )
+        warning.setTextFormat(QtCore.Qt.TextFormat.PlainText)
         warning.setWordWrap(True)
         warning.setStyleSheet(
             f"color: {TOKENS.warning}; padding: 10px; "
@@ -72,6 +377,10 @@ class ArchiveProjectDialog(QtWidgets.QDialog):
         # Progress log (read-only text area)
         self.progress_log = QtWidgets.QPlainTextEdit()
         self.progress_log.setReadOnly(True)
+        # Bounded, undo-less log: old lines roll off instead of growing the document.
+        self.progress_log.setMaximumBlockCount(2000)
+        self.progress_log.setUndoRedoEnabled(False)
+        self.progress_log.setCenterOnScroll(True)
         self.progress_log.setMaximumHeight(150)
         layout.addWidget(QtWidgets.QLabel("Progress Log:"))
         layout.addWidget(self.progress_log)
@@ -104,16 +413,46 @@ class ArchiveProjectDialog(QtWidgets.QDialog):
         layout.addWidget(button_box)
 
     def _check_git_status(self):
-        """Check git status and display in UI."""
-        git_service = GitService()
-
-        if not git_service.is_git_repository(self.project_path):
+        """Run the git check on the global thread pool so `git status` doesn't delay the first paint."""
+        self.git_status_label.setText("Checking git status...")
+        QtCore.QThreadPool.globalInstance().start(QtCore.QRunnable.create(self._do_git_check))
+
+    def _do_git_check(self):
+        """Worker-thread body: query git and hand the result back to the GUI thread."""
+        if not os.path.isdir(self.project_path):
+            result = (False, False, "")
+        else:
+            try:
+                git_mtime = os.stat(os.path.join(self.project_path, ".git")).st_mtime
+            except OSError:
+                git_mtime = None
+
+            now = time.monotonic()
+            cached = _GIT_STATUS_CACHE.get(self.project_path)
+            if cached and now - cached[0] < _GIT_STATUS_TTL and cached[1] == git_mtime:
+                result = cached[2:]
+            else:
+                git_service = GitService()
+                is_repo = git_service.is_git_repository(self.project_path)
+                has_changes, status_output = False, ""
+                if is_repo:
+                    has_changes, status_output = git_service.has_uncommitted_changes(self.project_path)
+                result = (is_repo, has_changes, status_output or "")
+                _GIT_STATUS_CACHE[self.project_path] = (now, git_mtime, *result)
+        try:
+            self._git_ready.emit(*result)
+        except RuntimeError:
+            # Dialog was destroyed before the check finished.
+            pass
+
+    @QtCore.Slot(bool, bool, str)
+    def _on_git_status(self, is_repo: bool, has_changes: bool, status_output: str):
+        """Display the git check result."""
+        if not is_repo:
             self.git_status_label.setText("✓ Not a git repository (no git check needed)")
             self.git_status_label.setStyleSheet(f"color: {TOKENS.success};")
             return
 
-        has_changes, status_output = git_service.has_uncommitted_changes(self.project_path)
-
         if has_changes:
             self.git_status_label.setText(
                 "⚠ Warning: Uncommitted git changes detected!\n"
@@ -123,205 +462,68 @@ class ArchiveProjectDialog(QtWidgets.QDialog):
 
             # Show git status in progress log
             self.progress_log.appendPlainText("Uncommitted changes:")
-            self.progress_log.appendPlainText(status_output or "")
+            self.progress_log.appendPlainText(status_output)
         else:
             self.git_status_label.setText("✓ Git repository is clean (no uncommitted changes)")
             self.git_status_label.setStyleSheet(f"color: {TOKENS.success};")
 
+    @QtCore.Slot(str)
     def _log(self, message: str):
-        """Add message to progress log."""
-        self.progress_log.appendPlainText(message)
-        QtWidgets.QApplication.processEvents()  # Update UI
-
-    def _delete_original_directory(self) -> bool:
-        """
-        Delete the original project directory using an elevated PowerShell process.
-
-        Returns:
-            True if successful, False otherwise
-        """
-        import base64
-        import subprocess
-
-        # Use a PowerShell single-quoted string for path safety; escape embedded single quotes.
-        path_ps = self.project_path.replace("'", "''")
-
-        # Inner payload runs elevated.
-        inner_ps = rf"""
-$ErrorActionPreference = "Stop"
-$path = '{path_ps}'
-
-if (Test-Path -LiteralPath $path) {{
-  # avoid killing the current PowerShell process
-  $myPid = $PID
-
-  if (-not (Get-Command handle64.exe -ErrorAction SilentlyContinue)) {{
-    Write-Error "handle64.exe not found on PATH. Put Sysinternals handle64.exe on PATH or use an absolute path."
-  }}
-
-  $pids = (& handle64.exe -accepteula -nobanner $path 2>$null |
-    ForEach-Object {{ if ($_ -match '\spid:\s+(\d+)\s') {{ [int]$matches[1] }} }} |
-    Sort-Object -Unique
-  ) | Where-Object {{ $_ -ne $myPid }}
-
-  if ($pids) {{
-    Stop-Process -Id $pids -Force -ErrorAction SilentlyContinue
-  }}
-
-  try {{
-    Remove-Item -LiteralPath $path -Recurse -Force -ErrorAction Stop
-  }}
-  catch {{
-    takeown /F $path /R /D Y | Out-Null
-    icacls $path /grant "$env:USERNAME:(OI)(CI)F" /T /C | Out-Null
-    Remove-Item -LiteralPath $path -Recurse -Force
-  }}
-}}
-"""
-
-        enc = base64.b64encode(inner_ps.encode("utf-16le")).decode("ascii")
-
-        # Outer wrapper: elevate if needed, wait, and return exit code.
-        outer_ps = rf"""
-$enc = "{enc}"
-$isAdmin = ([Security.Principal.WindowsPrincipal] [Security.Principal.WindowsIdentity]::GetCurrent()
-).IsInRole([Security.Principal.WindowsBuiltInRole]::Administrator)
-
-if ($isAdmin) {{
-  pwsh.exe -NoProfile -ExecutionPolicy Bypass -EncodedCommand $enc
-  exit $LASTEXITCODE
-}} else {{
-  $p = Start-Process pwsh.exe -Verb RunAs -Wait -PassThru -ArgumentList @(
-    '-NoProfile','-ExecutionPolicy','Bypass','-EncodedCommand',$enc
-  )
-  exit $p.ExitCode
-}}
-"""
-
-        try:
-            self._log("Requesting administrator rights to force-close handles and delete directory...")
-            QtWidgets.QApplication.processEvents()
-
-            result = subprocess.run(
-                ["pwsh.exe", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", outer_ps],
-                capture_output=True,
-                text=True,
-                timeout=180,
-            )
+        """Queue message for the progress log (flushed by _flush_timer)."""
+        self._log_buf.append(message)
 
-            # If user cancels UAC, you'll typically get a non-zero exit code.
-            if result.stdout and result.stdout.strip():
-                self._log(result.stdout.strip())
-            if result.stderr and result.stderr.strip():
-                self._log(result.stderr.strip())
-
-            return result.returncode == 0
+    def _flush_log(self):
+        """Append all buffered log messages in a single edit."""
+        if not self._log_buf:
+            return
+        self.progress_log.appendPlainText("\n".join(self._log_buf))
+        self._log_buf.clear()
 
-        except subprocess.TimeoutExpired:
-            self._log("Timed out while deleting directory.")
-            return False
-        except Exception as e:
-            self._log(f"Error deleting directory: {str(e)}")
-            return False
+    def reject(self):
+        """Ignore close/cancel while the archive worker is running."""
+        if self._worker is not None:
+            return
+        super().reject()
 
     def _start_archive(self):
-        """Start the archive process."""
+        """Start the archive process on the global thread pool."""
         self.archive_btn.setEnabled(False)
         self.cancel_btn.setEnabled(False)
+        self.delete_original_checkbox.setEnabled(False)
 
-        try:
-            # Step 1: Delete library folders (25%)
-            self.progress_bar.setValue(5)
-            self._log("\n=== Step 1: Deleting library folders ===")
-
-            deleted = ArchiveService.delete_library_folders(
-                self.project_path,
-                progress_callback=self._log
-            )
-
-            if deleted:
-                self._log(f"Deleted {len(deleted)} library folders")
-            else:
-                self._log("No library folders found to delete")
-
-            self.progress_bar.setValue(25)
-
-            # Step 2: Create archive (50%)
-            self._log("\n=== Step 2: Creating ZIP archive ===")
-            archive_dir = ArchiveService.get_archive_directory()
-            project_dir_name = Path(self.project_path).name
-            archive_filename = ArchiveService.generate_archive_filename(
-                self.project_uuid,
-                project_dir_name
-            )
-            archive_path = archive_dir / archive_filename
-
-            self.progress_bar.setValue(30)
-
-            success = ArchiveService.create_zip_archive(
-                self.project_path,
-                archive_path,
-                progress_callback=self._log
-            )
-
-            if not success:
-                raise Exception("Failed to create archive")
-
-            self.progress_bar.setValue(75)
-            self.archive_path = str(archive_path)
-            self.archive_size_mb = ArchiveService.get_archive_size_mb(archive_path)
-
-            # Step 3: Update database (100%)
-            self._log("\n=== Step 3: Updating database ===")
-            try:
-                # Use transaction to ensure database consistency
-                # NOTE: File operations (Steps 1-2) cannot be part of the SQLite transaction.
-                # The transaction only wraps the DB update to ensure atomicity of the
-                # database operation. If the DB update fails, we clean up the archive file
-                # to maintain consistency.
-                with self.db.transaction():
-                    self.db.archive_project(
-                        self.project_uuid,
-                        self.archive_path,
-                        self.archive_size_mb
-                    )
-            except Exception as db_error:
-                # If database update fails, clean up the archive file to prevent
-                # orphaned archives. This ensures we don't have ZIP files that aren't
-                # tracked in the database.
-                self._log(f"⚠ Database update failed: {db_error}")
-                self._log("Cleaning up archive file...")
-                if archive_path.exists():
-                    archive_path.unlink()
-                raise Exception(f"Database update failed: {db_error}")
+        self._worker = ArchiveWorker(
+            self.db.db_path,
+            self.project_uuid,
+            self.project_path,
+            self.delete_original_checkbox.isChecked()
+        )
 
-            self.progress_bar.setValue(100)
-            self._log(f"\n✓ Archive complete: {archive_filename}")
-            self._log(f"✓ Archive size: {self.archive_size_mb:.2f} MB")
-            self._log(f"✓ Archive path: {self.archive_path}")
+        queued = QtCore.Qt.ConnectionType.QueuedConnection
+        signals = self._worker.signals
+        signals.progress.connect(self._log, queued)
+        signals.percent.connect(self.progress_bar.setValue, queued)
+        signals.finished.connect(self._on_archive_finished, queued)
 
-            # Step 4 (optional): Delete original directory
-            if self.delete_original_checkbox.isChecked():
-                self._log("\n=== Step 4: Deleting original project directory ===")
-                self.progress_bar.setValue(95)
+        self._flush_timer.start()
+        QtCore.QThreadPool.globalInstance().start(self._worker)
 
-                deleted_ok = self._delete_original_directory()
-                if deleted_ok:
-                    self._log("✓ Original project directory deleted")
-                else:
-                    self._log("⚠ Failed to delete original directory (archive still created)")
+    @QtCore.Slot(bool, str)
+    def _on_archive_finished(self, success: bool, error: str):
+        """Handle worker completion on the GUI thread."""
+        worker = self._worker
+        self._worker = None
 
-                self.progress_bar.setValue(100)
+        self._flush_timer.stop()
+        self._flush_log()
 
+        if success:
+            self.archive_path = worker.archive_path
+            self.archive_size_mb = worker.archive_size_mb
             self.success = True
             self.accept()
+            return
 
-        except Exception as e:
-            self._log(f"\n✗ Archive failed: {e}")
-            QtWidgets.QMessageBox.critical(self, "Archive Failed", str(e))
-            self.cancel_btn.setEnabled(True)
-            self.cancel_btn.setText("Close")
-        finally:
-            # Ensure the UI is left in a usable state.
-            if not self.success:
-                self.cancel_btn.setEnabled(True)
+        # Ensure the UI is left in a usable state.
+        QtWidgets.QMessageBox.critical(self, "Archive Failed", error)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setText("Close")
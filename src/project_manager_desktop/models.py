@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import functools
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from PySide6 import QtCore
 
+from core.models import DocFile
+
+
+# Hot-path constants for data(): resolved once instead of per call through the enum namespaces.
+_DISPLAY_ROLE = QtCore.Qt.ItemDataRole.DisplayRole
+_TOOLTIP_ROLE = QtCore.Qt.ItemDataRole.ToolTipRole
+_ALIGNMENT_ROLE = QtCore.Qt.ItemDataRole.TextAlignmentRole
+_ALIGN_CENTER = int(QtCore.Qt.AlignmentFlag.AlignCenter)
+
 
 def _fmt_dt(value: Any) -> str:
     if not value:
@@ -12,11 +22,19 @@ def _fmt_dt(value: Any) -> str:
     # DB stores ISO strings; tolerate datetime too.
     if isinstance(value, datetime):
         return value.isoformat(sep=" ", timespec="seconds")
+    return _fmt_dt_str(str(value))
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_dt_str(value: str) -> str:
+    # Already "YYYY-MM-DD HH:MM:SS": nothing to normalize.
+    if len(value) == 19 and value[10] == " ":
+        return value
     try:
-        dt = datetime.fromisoformat(str(value))
+        dt = datetime.fromisoformat(value)
         return dt.isoformat(sep=" ", timespec="seconds")
     except Exception:
-        return str(value)
+        return value
 
 
 class ProjectsTableModel(QtCore.QAbstractTableModel):
@@ -31,17 +49,105 @@ class ProjectsTableModel(QtCore.QAbstractTableModel):
     def __init__(self, projects: Optional[List[Dict[str, Any]]] = None) -> None:
         super().__init__()
         self._projects: List[Dict[str, Any]] = projects or []
+        # Per-row display strings (one per column) and tooltips, parallel to _projects.
+        self._display: List[List[str]] = []
+        self._tooltip: List[str] = []
+        # Pre-lowercased "name path tags" per row, for the filter proxy.
+        self._haystack: List[str] = []
+        # Pre-lowercased display strings per row: the sort key for each column.
+        self._sort_keys: List[tuple[str, ...]] = []
+        # uuid -> row in _projects; kept in step with resets and sorts.
+        self._uuid_to_row: Dict[str, int] = {}
+        self._rebuild_cache()
 
     def set_projects(self, projects: List[Dict[str, Any]]) -> None:
         self.beginResetModel()
         self._projects = projects
+        self._rebuild_cache()
         self.endResetModel()
 
+    def _rebuild_cache(self) -> None:
+        self._display = []
+        self._tooltip = []
+        self._haystack = []
+        self._sort_keys = []
+        for project in self._projects:
+            display, tooltip = self._build_row(project)
+            self._display.append(display)
+            self._tooltip.append(tooltip)
+            self._haystack.append(self._build_haystack(display))
+            self._sort_keys.append(self._build_sort_keys(display))
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._uuid_to_row = {p.get("uuid"): row for row, p in enumerate(self._projects)}
+
+    def update_project(self, uuid: str, project: Dict[str, Any]) -> bool:
+        """
+        Replace one project's record in place and repaint only its row.
+
+        Returns:
+            True if the project is in the model, False otherwise.
+        """
+        row = self._uuid_to_row.get(uuid)
+        if row is None or not project:
+            return False
+
+        self._projects[row] = project
+        display, tooltip = self._build_row(project)
+        self._display[row] = display
+        self._tooltip[row] = tooltip
+        self._haystack[row] = self._build_haystack(display)
+        self._sort_keys[row] = self._build_sort_keys(display)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        return True
+
+    @classmethod
+    def _build_haystack(cls, display: List[str]) -> str:
+        return " ".join((display[cls.COL_NAME], display[cls.COL_PATH], display[cls.COL_TAGS])).lower()
+
+    @staticmethod
+    def _build_sort_keys(display: List[str]) -> tuple[str, ...]:
+        # Same order as the displayed text, case-insensitive ("★" sorts before "☆").
+        return tuple(text.lower() for text in display)
+
+    @staticmethod
+    def _build_row(project: Dict[str, Any]) -> tuple[List[str], str]:
+        name = project.get("ai_app_name") or project.get("name") or ""
+        path = project.get("root_path") or ""
+        tags = project.get("tags") or ()
+        if not isinstance(tags, str):
+            tags = ", ".join(filter(None, map(str, tags)))
+        display = [
+            "★" if project.get("favorite", 0) in (1, True) else "☆",
+            name,
+            path,
+            tags,
+            _fmt_dt(project.get("last_updated")),
+        ]
+        desc = project.get("description") or project.get("ai_app_description") or ""
+        tooltip = "\n".join([line for line in [name, path, tags, desc] if line])
+        return display, tooltip
+
     def project_at(self, row: int) -> Optional[Dict[str, Any]]:
         if 0 <= row < len(self._projects):
             return self._projects[row]
         return None
 
+    def row_for_uuid(self, uuid: str) -> Optional[int]:
+        return self._uuid_to_row.get(uuid)
+
+    def sort_key(self, row: int, column: int) -> str:
+        """Cached sort key for a cell (its lower-cased display text)."""
+        return self._sort_keys[row][column]
+
+    def row_haystack(self, row: int) -> str:
+        """Lower-cased "name path tags" text for row, as shown in the table."""
+        return self._haystack[row]
+
+    def is_favorite(self, row: int) -> bool:
+        return self._display[row][self.COL_FAVORITE] == "★"
+
     def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:  # noqa: N802
         if parent.isValid():
             return 0
@@ -68,80 +174,214 @@ class ProjectsTableModel(QtCore.QAbstractTableModel):
     def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> Any:  # noqa: N802
         if not index.isValid():
             return None
-        project = self.project_at(index.row())
-        if not project:
+        row = index.row()
+        if not 0 <= row < len(self._display):
             return None
 
-        col = index.column()
-
-        if role == QtCore.Qt.ItemDataRole.DisplayRole:
-            if col == self.COL_FAVORITE:
-                return "★" if project.get("favorite", 0) in (1, True) else "☆"
-            if col == self.COL_NAME:
-                return project.get("ai_app_name") or project.get("name") or ""
-            if col == self.COL_PATH:
-                return project.get("root_path") or ""
-            if col == self.COL_TAGS:
-                tags = project.get("tags") or []
-                if isinstance(tags, str):
-                    return tags
-                return ", ".join([str(t) for t in tags if t])
-            if col == self.COL_UPDATED:
-                return _fmt_dt(project.get("last_updated"))
-
-        if role == QtCore.Qt.ItemDataRole.ToolTipRole:
-            name = project.get("ai_app_name") or project.get("name") or ""
-            path = project.get("root_path") or ""
-            tags = project.get("tags") or []
-            if not isinstance(tags, str):
-                tags = ", ".join([str(t) for t in tags if t])
-            desc = project.get("description") or project.get("ai_app_description") or ""
-            return "\n".join([line for line in [name, path, tags, desc] if line])
-
-        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole and col == self.COL_FAVORITE:
-            return int(QtCore.Qt.AlignmentFlag.AlignCenter)
+        if role == _DISPLAY_ROLE:
+            return self._display[row][index.column()]
+
+        if role == _TOOLTIP_ROLE:
+            return self._tooltip[row]
+
+        if role == _ALIGNMENT_ROLE and index.column() == self.COL_FAVORITE:
+            return _ALIGN_CENTER
 
         return None
 
     def sort(self, column: int, order: QtCore.Qt.SortOrder = QtCore.Qt.SortOrder.AscendingOrder) -> None:  # noqa: N802
         reverse = order == QtCore.Qt.SortOrder.DescendingOrder
 
-        def key_fn(p: Dict[str, Any]):
-            if column == self.COL_FAVORITE:
-                return 1 if p.get("favorite", 0) in (1, True) else 0
-            if column == self.COL_NAME:
-                return (p.get("name") or "").lower()
-            if column == self.COL_PATH:
-                return (p.get("root_path") or "").lower()
-            if column == self.COL_TAGS:
-                tags = p.get("tags") or []
-                if isinstance(tags, str):
-                    return tags.lower()
-                return " ".join([str(t).lower() for t in tags if t])
-            if column == self.COL_UPDATED:
-                return str(p.get("last_updated") or "")
-            return ""
+        if not 0 <= column < len(self.HEADERS):
+            return
+        keys = [row_keys[column] for row_keys in self._sort_keys]
+
+        # Sort a permutation and apply it to the projects and their cached rows together.
+        order_idx = sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
 
         self.layoutAboutToBeChanged.emit()
-        self._projects.sort(key=key_fn, reverse=reverse)
+        self._projects[:] = [self._projects[i] for i in order_idx]
+        self._display = [self._display[i] for i in order_idx]
+        self._tooltip = [self._tooltip[i] for i in order_idx]
+        self._haystack = [self._haystack[i] for i in order_idx]
+        self._sort_keys = [self._sort_keys[i] for i in order_idx]
+        self._reindex()
         self.layoutChanged.emit()
 
 
-class ProjectsFilterProxyModel(QtCore.QSortFilterProxyModel):
+class DocsTableModel(QtCore.QAbstractTableModel):
+    COL_FILENAME = 0
+    COL_PATH = 1
+    COL_MODIFIED = 2
+
+    HEADERS = ["Filename", "Path", "Modified"]
+
+    # Rows exposed per fetchMore(); the view pulls more as it scrolls.
+    FETCH_BATCH = 64
+
+    def __init__(self, docs: Optional[List[DocFile]] = None) -> None:
+        super().__init__()
+        self._docs: List[DocFile] = []
+        # Per-row display strings and pre-lowercased "filename\npath" for the filter proxy,
+        # built only for rows already exposed to the view.
+        self._display: List[tuple[str, str, str]] = []
+        self._haystack: List[str] = []
+        self._load(docs or [])
+
+    def set_docs(self, docs: List[DocFile]) -> None:
+        self.beginResetModel()
+        self._load(docs)
+        self.endResetModel()
+
+    def _load(self, docs: List[DocFile]) -> None:
+        self._docs = list(docs)
+        self._display = []
+        self._haystack = []
+        self._extend(self.FETCH_BATCH)
+
+    def _extend(self, count: int) -> None:
+        start = len(self._display)
+        for doc in self._docs[start:start + count]:
+            filename, path = doc.filename, doc.relative_path
+            self._display.append((filename, path, doc.modified_date.strftime("%Y-%m-%d %H:%M")))
+            # Newline-joined so a query never matches across the filename/path boundary.
+            self._haystack.append(f"{filename}\n{path}".lower())
+
+    def canFetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:  # noqa: N802
+        if parent.isValid():
+            return False
+        return len(self._display) < len(self._docs)
+
+    def fetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> None:  # noqa: N802
+        if parent.isValid():
+            return
+        self._fetch(self.FETCH_BATCH)
+
+    def fetch_all(self) -> None:
+        """Expose every remaining row (a filter must see all docs, not just the scrolled-in ones)."""
+        self._fetch(len(self._docs))
+
+    def _fetch(self, count: int) -> None:
+        start = len(self._display)
+        count = min(count, len(self._docs) - start)
+        if count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), start, start + count - 1)
+        self._extend(count)
+        self.endInsertRows()
+
+    def doc_at(self, row: int) -> Optional[DocFile]:
+        if 0 <= row < len(self._display):
+            return self._docs[row]
+        return None
+
+    def row_haystack(self, row: int) -> str:
+        return self._haystack[row]
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:  # noqa: N802
+        if parent.isValid():
+            return 0
+        return len(self._display)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:  # noqa: N802
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(  # noqa: N802
+        self,
+        section: int,
+        orientation: QtCore.Qt.Orientation,
+        role: int = QtCore.Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Orientation.Horizontal:
+            if 0 <= section < len(self.HEADERS):
+                return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> Any:  # noqa: N802
+        if not index.isValid() or role != _DISPLAY_ROLE:
+            return None
+        row = index.row()
+        if not 0 <= row < len(self._display):
+            return None
+        return self._display[row][index.column()]
+
+
+# Typing pause before a search query re-filters; shared by the projects and docs filters.
+SEARCH_DEBOUNCE_MS = 120
+
+
+class _DebouncedFilterProxyModel(QtCore.QSortFilterProxyModel):
+    """Filter proxy whose set_query coalesces bursts of keystrokes into a single filter pass."""
+
     def __init__(self) -> None:
         super().__init__()
-        self._query = ""
-        self._favorites_only = False
+        self._query_lower = ""
 
-        self.setFilterCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseInsensitive)
-        self.setSortCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseInsensitive)
+        self._debounce = QtCore.QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(SEARCH_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._apply_query)
 
     def set_query(self, query: str) -> None:
-        self._query = (query or "").strip()
+        query_lower = (query or "").strip().lower()
+        if query_lower == self._query_lower:
+            # e.g. only surrounding whitespace or letter case changed: same rows match.
+            return
+        self._query_lower = query_lower
+        self._debounce.start()
+
+    def flush_query(self) -> None:
+        """Apply a pending query change now instead of after the debounce interval."""
+        if self._debounce.isActive():
+            self._debounce.stop()
+            self._apply_query()
+
+    def _apply_query(self) -> None:
         self.invalidateFilter()
 
+
+class DocsFilterProxyModel(_DebouncedFilterProxyModel):
+    """Case-insensitive substring filter over a doc's filename and relative path."""
+
+    def setSourceModel(self, model: QtCore.QAbstractItemModel) -> None:  # noqa: N802
+        super().setSourceModel(model)
+        # Connected after the proxy's own reset handling, so rows fetched here are filtered normally.
+        model.modelReset.connect(self._fetch_all_if_filtering)
+
+    def _apply_query(self) -> None:
+        self._fetch_all_if_filtering()
+        super()._apply_query()
+
+    def _fetch_all_if_filtering(self) -> None:
+        model = self.sourceModel()
+        if self._query_lower and model is not None:
+            model.fetch_all()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QtCore.QModelIndex) -> bool:  # noqa: N802
+        if not self._query_lower:
+            return True
+        model = self.sourceModel()
+        if model is None:
+            return True
+        return self._query_lower in model.row_haystack(source_row)
+
+
+class ProjectsFilterProxyModel(_DebouncedFilterProxyModel):
+    def __init__(self) -> None:
+        super().__init__()
+        self._favorites_only = False
+
+        self.setFilterCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseInsensitive)
+        self.setSortCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseInsensitive)
+
     def set_favorites_only(self, enabled: bool) -> None:
         self._favorites_only = bool(enabled)
+        # Applies immediately, together with any pending query change.
+        self._debounce.stop()
         self.invalidateFilter()
 
     def filterAcceptsRow(self, source_row: int, source_parent: QtCore.QModelIndex) -> bool:  # noqa: N802
@@ -149,26 +389,16 @@ class ProjectsFilterProxyModel(QtCore.QSortFilterProxyModel):
         if model is None:
             return True
 
-        idx_name = model.index(source_row, ProjectsTableModel.COL_NAME, source_parent)
-        idx_path = model.index(source_row, ProjectsTableModel.COL_PATH, source_parent)
-        idx_tags = model.index(source_row, ProjectsTableModel.COL_TAGS, source_parent)
-        idx_fav = model.index(source_row, ProjectsTableModel.COL_FAVORITE, source_parent)
-
-        if self._favorites_only:
-            fav_text = str(model.data(idx_fav, QtCore.Qt.ItemDataRole.DisplayRole) or "")
-            if fav_text != "★":
-                return False
+        if self._favorites_only and not model.is_favorite(source_row):
+            return False
 
-        if not self._query:
+        if not self._query_lower:
             return True
 
-        hay = " ".join(
-            [
-                str(model.data(idx_name, QtCore.Qt.ItemDataRole.DisplayRole) or ""),
-                str(model.data(idx_path, QtCore.Qt.ItemDataRole.DisplayRole) or ""),
-                str(model.data(idx_tags, QtCore.Qt.ItemDataRole.DisplayRole) or ""),
-            ]
-        )
-        return self._query.lower() in hay.lower()
-
+        return self._query_lower in model.row_haystack(source_row)
 
+    def lessThan(self, left: QtCore.QModelIndex, right: QtCore.QModelIndex) -> bool:  # noqa: N802
+        # Compare the model's cached keys directly: no data() calls or QVariant round trips.
+        model = self.sourceModel()
+        column = left.column()
+        return model.sort_key(left.row(), column) < model.sort_key(right.row(), column)
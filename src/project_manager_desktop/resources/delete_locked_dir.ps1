@@ -0,0 +1,66 @@
+# Force-delete a directory whose files may be held open by other processes.
+# Relaunches itself elevated when not running as administrator; exit code 0 means deleted.
+param(
+  [Parameter(Mandatory = $true)][string]$Path,
+  # Comma-separated PIDs of locking processes, when the caller already knows them.
+  [string]$Pids = "",
+  # Enumerate locking PIDs with Sysinternals handle64.exe (needs administrator rights).
+  [switch]$ScanHandles
+)
+
+$ErrorActionPreference = "Stop"
+# Flush each progress line immediately so the caller can stream it.
+[Console]::Out.AutoFlush = $true
+
+$isAdmin = ([Security.Principal.WindowsPrincipal] [Security.Principal.WindowsIdentity]::GetCurrent()
+).IsInRole([Security.Principal.WindowsBuiltInRole]::Administrator)
+
+if (-not $isAdmin) {
+  $argList = @(
+    '-NoProfile', '-NonInteractive', '-ExecutionPolicy', 'Bypass',
+    '-File', "`"$PSCommandPath`"", '-Path', "`"$($Path.TrimEnd('\'))`""
+  )
+  if ($Pids) { $argList += @('-Pids', $Pids) }
+  if ($ScanHandles) { $argList += '-ScanHandles' }
+  $p = Start-Process pwsh.exe -Verb RunAs -Wait -PassThru -ArgumentList $argList
+  exit $p.ExitCode
+}
+
+if (-not (Test-Path -LiteralPath $Path)) {
+  exit 0
+}
+
+# avoid killing the current PowerShell process
+$myPid = $PID
+
+$pidList = @()
+if ($Pids) {
+  $pidList = $Pids -split ',' | ForEach-Object { [int]$_ } | Where-Object { $_ -ne $myPid }
+}
+elseif ($ScanHandles) {
+  if (-not (Get-Command handle64.exe -ErrorAction SilentlyContinue)) {
+    Write-Error "handle64.exe not found on PATH. Put Sysinternals handle64.exe on PATH or use an absolute path."
+  }
+
+  $pidList = (& handle64.exe -accepteula -nobanner $Path 2>$null |
+    ForEach-Object { if ($_ -match '\spid:\s+(\d+)\s') { [int]$matches[1] } } |
+    Sort-Object -Unique
+  ) | Where-Object { $_ -ne $myPid }
+}
+
+if ($pidList) {
+  Write-Output "Stopping $(@($pidList).Count) locking process(es)..."
+  Stop-Process -Id $pidList -Force -ErrorAction SilentlyContinue
+}
+
+Write-Output "Deleting $Path..."
+try {
+  Remove-Item -LiteralPath $Path -Recurse -Force -ErrorAction Stop
+}
+catch {
+  Write-Output "Delete failed; taking ownership and retrying..."
+  takeown /F $Path /R /D Y | Out-Null
+  icacls $Path /grant "$env:USERNAME:(OI)(CI)F" /T /C | Out-Null
+  Remove-Item -LiteralPath $Path -Recurse -Force
+}
+Write-Output "Deleted $Path"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 
 from PySide6 import QtGui, QtWidgets
@@ -40,6 +41,8 @@ class ThemeTokens:
 TOKENS = ThemeTokens()
 
 
+# Tokens are frozen (hashable), so the stylesheet for a given token set never changes.
+@functools.lru_cache(maxsize=4)
 def build_qss(t: ThemeTokens = TOKENS) -> str:
     r_sm = f"{t.radius_sm}px"
     r_md = f"{t.radius_md}px"
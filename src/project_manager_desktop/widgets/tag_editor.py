@@ -1,12 +1,53 @@
 """Tag editor widget for managing project tags."""
 
-import re
-from typing import List
+import html
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from PySide6 import QtCore, QtWidgets
 
 from ..theme import TOKENS
 
+# Valid custom tag: lowercase ASCII letters and digits only.
+_TAG_ALLOWED_BYTES = b"abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def _is_valid_tag(tag: str) -> bool:
+    """True if tag is non-empty lowercase ASCII alphanumeric (one bytes.translate, no regex)."""
+    if not tag:
+        return False
+    try:
+        return not tag.encode("ascii").translate(None, _TAG_ALLOWED_BYTES)
+    except UnicodeEncodeError:
+        return False
+
+
+# Tag widget styles, set once per container and matched by objectName so Qt parses them once.
+_PILL_CSS = f"""
+QLabel#tagPill {{
+    background-color: rgba(91, 140, 255, 0.18);
+    color: {TOKENS.fg};
+    border: 1px solid rgba(91, 140, 255, 0.35);
+    border-radius: 8px;
+    padding: 4px 8px;
+}}
+"""
+
+# Inline style for the pill's "×" remove link.
+_REMOVE_LINK_STYLE = f"color: {TOKENS.fg_muted}; text-decoration: none; font-size: 14px; font-weight: 600;"
+
+_BTN_CSS = f"""
+QPushButton#tagBtn {{
+    background-color: transparent;
+    color: {TOKENS.fg};
+    border: 1px solid {TOKENS.border};
+    border-radius: 8px;
+    padding: 4px 10px;
+}}
+QPushButton#tagBtn:hover {{
+    background-color: {TOKENS.bg_hover};
+}}
+"""
+
 
 class QFlowLayout(QtWidgets.QLayout):
     """Flow layout that wraps widgets to the next line when needed."""
@@ -14,6 +55,10 @@ class QFlowLayout(QtWidgets.QLayout):
     def __init__(self, parent=None, margin=0, spacing=-1):
         super().__init__(parent)
         self._item_list = []
+        # Per-pass layout caches, cleared by invalidate(): item (width, height) size hints
+        # (None for hidden items) and heightForWidth results keyed by width.
+        self._size_cache: Optional[List[Optional[Tuple[int, int]]]] = None
+        self._hfw_cache: Dict[int, int] = {}
         self.setContentsMargins(margin, margin, margin, margin)
         self.setSpacing(spacing)
 
@@ -23,6 +68,7 @@ class QFlowLayout(QtWidgets.QLayout):
 
     def addItem(self, item):
         self._item_list.append(item)
+        self._clear_caches()
 
     def count(self):
         return len(self._item_list)
@@ -34,9 +80,27 @@ class QFlowLayout(QtWidgets.QLayout):
 
     def takeAt(self, index):
         if 0 <= index < len(self._item_list):
-            return self._item_list.pop(index)
+            item = self._item_list.pop(index)
+            self._clear_caches()
+            return item
         return None
 
+    def reorder(self, widgets):
+        """Order items to follow widgets; items for other widgets keep their order after them."""
+        rank = {id(w): i for i, w in enumerate(widgets)}
+        last = len(rank)
+        self._item_list.sort(key=lambda item: rank.get(id(item.widget()), last))
+        self.invalidate()
+
+    def _clear_caches(self):
+        self._size_cache = None
+        self._hfw_cache.clear()
+
+    def invalidate(self):
+        # Called by Qt whenever a child's size hint or visibility changes.
+        self._clear_caches()
+        super().invalidate()
+
     def expandingDirections(self):
         return QtCore.Qt.Orientation(0)
 
@@ -44,7 +108,11 @@ class QFlowLayout(QtWidgets.QLayout):
         return True
 
     def heightForWidth(self, width):
-        return self._do_layout(QtCore.QRect(0, 0, width, 0), True)
+        height = self._hfw_cache.get(width)
+        if height is None:
+            height = self._do_layout(QtCore.QRect(0, 0, width, 0), True)
+            self._hfw_cache[width] = height
+        return height
 
     def setGeometry(self, rect):
         super().setGeometry(rect)
@@ -62,43 +130,87 @@ class QFlowLayout(QtWidgets.QLayout):
                            margins.top() + margins.bottom())
         return size
 
+    def _item_sizes(self):
+        """Size hint per item, measured once until the next invalidate()."""
+        if self._size_cache is None:
+            sizes = []
+            for item in self._item_list:
+                if item.isEmpty():
+                    # Hidden widgets (e.g. an inactive placeholder) take no space.
+                    sizes.append(None)
+                else:
+                    sh = item.sizeHint()
+                    sizes.append((sh.width(), sh.height()))
+            self._size_cache = sizes
+        return self._size_cache
+
     def _do_layout(self, rect, test_only):
-        x = rect.x()
-        y = rect.y()
+        rect_x = rect.x()
+        rect_y = rect.y()
+        rect_right = rect.right()
+        x = rect_x
+        y = rect_y
         line_height = 0
         spacing = self.spacing()
-
-        for item in self._item_list:
-            widget = item.widget()
-            space_x = spacing
-            space_y = spacing
-
-            next_x = x + item.sizeHint().width() + space_x
-            if next_x - space_x > rect.right() and line_height > 0:
-                x = rect.x()
-                y = y + line_height + space_y
-                next_x = x + item.sizeHint().width() + space_x
+        make_rect = QtCore.QRect
+
+        for item, size in zip(self._item_list, self._item_sizes()):
+            if size is None:
+                continue
+            width, height = size
+
+            next_x = x + width + spacing
+            if next_x - spacing > rect_right and line_height > 0:
+                x = rect_x
+                y += line_height + spacing
+                next_x = x + width + spacing
                 line_height = 0
 
             if not test_only:
-                item.setGeometry(QtCore.QRect(QtCore.QPoint(x, y), item.sizeHint()))
+                item.setGeometry(make_rect(x, y, width, height))
 
             x = next_x
-            line_height = max(line_height, item.sizeHint().height())
+            if height > line_height:
+                line_height = height
+
+        return y + line_height - rect_y
 
-        return y + line_height - rect.y()
+
+class _TagPill(QtWidgets.QLabel):
+    """A tag pill: a single label, with an "×" link (href = tag) when removable."""
+
+    def __init__(self, tag: str, removable: bool, remove_cb: Callable[[str], None]):
+        if removable:
+            escaped = html.escape(tag, quote=True)
+            super().__init__(f'{escaped}&nbsp;&nbsp;<a href="{escaped}" style="{_REMOVE_LINK_STYLE}">×</a>')
+            self.setTextFormat(QtCore.Qt.TextFormat.RichText)
+            self.linkActivated.connect(remove_cb)
+        else:
+            super().__init__(tag)
+            self.setTextFormat(QtCore.Qt.TextFormat.PlainText)
+        self.setObjectName("tagPill")
 
 
 class TagEditorWidget(QtWidgets.QWidget):
     """Widget for editing project tags with add/remove functionality."""
 
-    # Signal emitted when tags are modified
-    tags_changed = QtCore.Signal(list)
+    # Signal emitted when tags are modified (immutable snapshot; safe to keep)
+    tags_changed = QtCore.Signal(tuple)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._current_tags: List[str] = []
+        # Set mirror of _current_tags for O(1) membership checks.
+        self._current_tags_set: Set[str] = set()
+        # Immutable copy of _current_tags handed to callers; None when stale.
+        self._tags_snapshot: Optional[Tuple[str, ...]] = None
         self._available_tags: List[str] = []
+        self._available_tags_set: Set[str] = set()
+        # Live widgets per tag, so refreshes only create/destroy the differences.
+        self._current_pills: Dict[str, QtWidgets.QWidget] = {}
+        self._available_btns: Dict[str, QtWidgets.QWidget] = {}
+        # Set when the available list changed while hidden; rebuilt on the next Show.
+        self._available_dirty = False
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -121,10 +233,15 @@ class TagEditorWidget(QtWidgets.QWidget):
         current_scroll.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
         self.current_tags_widget = QtWidgets.QWidget()
+        self.current_tags_widget.setStyleSheet(_PILL_CSS)
         self.current_tags_layout = QFlowLayout(self.current_tags_widget)
         self.current_tags_layout.setContentsMargins(4, 4, 4, 4)
         self.current_tags_layout.setSpacing(6)
 
+        self._current_placeholder = QtWidgets.QLabel("No tags")
+        self._current_placeholder.setProperty("role", "muted")
+        self.current_tags_layout.addWidget(self._current_placeholder)
+
         current_scroll.setWidget(self.current_tags_widget)
         layout.addWidget(current_scroll)
 
@@ -140,10 +257,16 @@ class TagEditorWidget(QtWidgets.QWidget):
         available_scroll.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
         self.available_tags_widget = QtWidgets.QWidget()
+        self.available_tags_widget.setStyleSheet(_BTN_CSS)
+        self.available_tags_widget.installEventFilter(self)
         self.available_tags_layout = QFlowLayout(self.available_tags_widget)
         self.available_tags_layout.setContentsMargins(4, 4, 4, 4)
         self.available_tags_layout.setSpacing(6)
 
+        self._available_placeholder = QtWidgets.QLabel("No available tags")
+        self._available_placeholder.setProperty("role", "muted")
+        self.available_tags_layout.addWidget(self._available_placeholder)
+
         available_scroll.setWidget(self.available_tags_widget)
         layout.addWidget(available_scroll)
 
@@ -159,133 +282,142 @@ class TagEditorWidget(QtWidgets.QWidget):
         custom_layout.addWidget(self.add_custom_btn)
         layout.addLayout(custom_layout)
 
+        # One dispatcher per action instead of a closure per tag widget.
+        self._add_mapper = QtCore.QSignalMapper(self)
+        self._add_mapper.mappedString.connect(self._add_tag)
+
         # Connect signals
         self.add_custom_btn.clicked.connect(self._on_add_custom_tag)
         self.custom_tag_input.returnPressed.connect(self._on_add_custom_tag)
 
     def set_tags(self, tags: List[str]) -> None:
-        """Set the current tags."""
-        self._current_tags = list(tags) if tags else []
-        self._refresh_current_tags()
+        """Set the current tags (deduplicated, first occurrence order kept)."""
+        # dict.fromkeys dedupes in insertion order; its keys also seed the membership set.
+        unique = dict.fromkeys(tags or ())
+        self._current_tags = list(unique)
+        self._current_tags_set = set(unique)
+        self._tags_snapshot = None
+        self._refresh_all()
 
     def set_available_tags(self, tags: List[str]) -> None:
-        """Set the available tags from database."""
-        self._available_tags = list(tags) if tags else []
-        self._refresh_available_tags()
-
-    def get_tags(self) -> List[str]:
-        """Get the current tags."""
-        return list(self._current_tags)
+        """Set the available tags from database (deduplicated and sorted once here)."""
+        self._available_tags = sorted(dict.fromkeys(tags or ()), key=str.casefold)
+        self._available_tags_set = set(self._available_tags)
+        self._refresh_all()
+
+    def get_tags(self) -> Tuple[str, ...]:
+        """Get the current tags as an immutable snapshot."""
+        if self._tags_snapshot is None:
+            self._tags_snapshot = tuple(self._current_tags)
+        return self._tags_snapshot
+
+    def _refresh_all(self, available: bool = True) -> None:
+        """Refresh both tag areas (or only the current one) under a single updates-disabled window."""
+        self.setUpdatesEnabled(False)
+        try:
+            self._refresh_current_tags()
+            if available:
+                self._refresh_available_tags()
+        finally:
+            self.setUpdatesEnabled(True)
 
     def _refresh_current_tags(self) -> None:
         """Refresh the current tags display."""
-        # Clear existing widgets
-        while self.current_tags_layout.count():
-            item = self.current_tags_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        # Add tag pills with remove buttons
-        for tag in self._current_tags:
-            pill = self._create_tag_pill(tag, removable=True)
-            self.current_tags_layout.addWidget(pill)
-
-        # Add placeholder if no tags
-        if not self._current_tags:
-            placeholder = QtWidgets.QLabel("No tags")
-            placeholder.setProperty("role", "muted")
-            self.current_tags_layout.addWidget(placeholder)
+        self._sync_flow(
+            self.current_tags_layout,
+            self._current_pills,
+            self._current_tags,
+            lambda tag: self._create_tag_pill(tag, removable=True),
+            self._current_placeholder,
+        )
 
     def _refresh_available_tags(self) -> None:
-        """Refresh the available tags display."""
-        # Clear existing widgets
-        while self.available_tags_layout.count():
-            item = self.available_tags_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        """Refresh the available tags display (deferred until the area is visible)."""
+        if not self.available_tags_widget.isVisible():
+            self._available_dirty = True
+            return
+        self._available_dirty = False
 
         # Filter out tags that are already in current tags
-        available = [tag for tag in self._available_tags if tag not in self._current_tags]
-
-        # Add clickable tag buttons
-        for tag in available:
-            btn = self._create_tag_button(tag)
-            self.available_tags_layout.addWidget(btn)
+        current = self._current_tags_set
+        available = [tag for tag in self._available_tags if tag not in current]
+        self._sync_flow(
+            self.available_tags_layout,
+            self._available_btns,
+            available,
+            self._create_tag_button,
+            self._available_placeholder,
+        )
 
-        # Add placeholder if no available tags
-        if not available:
-            placeholder = QtWidgets.QLabel("No available tags")
-            placeholder.setProperty("role", "muted")
-            self.available_tags_layout.addWidget(placeholder)
+    def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:  # noqa: N802
+        if (
+            obj is self.available_tags_widget
+            and event.type() == QtCore.QEvent.Type.Show
+            and self._available_dirty
+        ):
+            self._refresh_available_tags()
+        return super().eventFilter(obj, event)
+
+    @staticmethod
+    def _sync_flow(
+        layout: QFlowLayout,
+        widgets: Dict[str, QtWidgets.QWidget],
+        tags: List[str],
+        factory: Callable[[str], QtWidgets.QWidget],
+        placeholder: QtWidgets.QLabel,
+    ) -> None:
+        """Make layout show one widget per tag, in order, creating/destroying only the differences."""
+        # One layout/paint pass for the whole batch instead of one per inserted widget.
+        container = layout.parentWidget()
+        container.setUpdatesEnabled(False)
+        try:
+            wanted = set(tags)
+            for tag in [t for t in widgets if t not in wanted]:
+                widget = widgets.pop(tag)
+                layout.removeWidget(widget)
+                widget.deleteLater()
+
+            for tag in tags:
+                if tag not in widgets:
+                    widget = factory(tag)
+                    widgets[tag] = widget
+                    layout.addWidget(widget)
+
+            layout.reorder([widgets[tag] for tag in tags])
+            placeholder.setVisible(not tags)
+        finally:
+            container.setUpdatesEnabled(True)
 
     def _create_tag_pill(self, tag: str, removable: bool = False) -> QtWidgets.QWidget:
         """Create a tag pill widget."""
-        widget = QtWidgets.QWidget()
-        layout = QtWidgets.QHBoxLayout(widget)
-        layout.setContentsMargins(8, 4, 8, 4)
-        layout.setSpacing(4)
-
-        label = QtWidgets.QLabel(tag)
-        layout.addWidget(label)
-
-        if removable:
-            remove_btn = QtWidgets.QToolButton()
-            remove_btn.setText("×")
-            remove_btn.setStyleSheet(
-                f"font-size: 14px; font-weight: 600; border: none; padding: 0px; color: {TOKENS.fg_muted};"
-            )
-            remove_btn.setMaximumSize(16, 16)
-            remove_btn.clicked.connect(lambda: self._remove_tag(tag))
-            layout.addWidget(remove_btn)
-
-        widget.setStyleSheet(
-            f"""
-            QWidget {{
-                background-color: rgba(91, 140, 255, 0.18);
-                color: {TOKENS.fg};
-                border: 1px solid rgba(91, 140, 255, 0.35);
-                border-radius: 8px;
-            }}
-            """
-        )
-
-        return widget
+        return _TagPill(tag, removable, self._remove_tag)
 
     def _create_tag_button(self, tag: str) -> QtWidgets.QPushButton:
         """Create a clickable tag button."""
         btn = QtWidgets.QPushButton(tag)
-        btn.setStyleSheet(
-            f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {TOKENS.fg};
-                border: 1px solid {TOKENS.border};
-                border-radius: 8px;
-                padding: 4px 10px;
-            }}
-            QPushButton:hover {{
-                background-color: {TOKENS.bg_hover};
-            }}
-            """
-        )
-        btn.clicked.connect(lambda: self._add_tag(tag))
+        btn.setObjectName("tagBtn")
+        btn.clicked.connect(self._add_mapper.map)
+        self._add_mapper.setMapping(btn, tag)
         return btn
 
     def _add_tag(self, tag: str) -> None:
         """Add a tag to current tags."""
-        if tag and tag not in self._current_tags:
+        if tag and tag not in self._current_tags_set:
             self._current_tags.append(tag)
-            self._refresh_current_tags()
-            self._refresh_available_tags()
-            self.tags_changed.emit(self._current_tags)
+            self._current_tags_set.add(tag)
+            self._tags_snapshot = None
+            # Custom tags outside the available list don't change the available area.
+            self._refresh_all(available=tag in self._available_tags_set)
+            self.tags_changed.emit(self.get_tags())
 
     def _remove_tag(self, tag: str) -> None:
         """Remove a tag from current tags."""
-        if tag in self._current_tags:
+        if tag in self._current_tags_set:
             self._current_tags.remove(tag)
-            self._refresh_current_tags()
-            self._refresh_available_tags()
-            self.tags_changed.emit(self._current_tags)
+            self._current_tags_set.discard(tag)
+            self._tags_snapshot = None
+            self._refresh_all(available=tag in self._available_tags_set)
+            self.tags_changed.emit(self.get_tags())
 
     def _on_add_custom_tag(self) -> None:
         """Handle adding a custom tag."""
@@ -295,7 +427,7 @@ class TagEditorWidget(QtWidgets.QWidget):
             return
 
         # Validate tag (alphanumeric lowercase only)
-        if not re.match(r'^[a-z0-9]+$', tag):
+        if not _is_valid_tag(tag):
             QtWidgets.QMessageBox.warning(
                 self,
                 "Invalid Tag",
@@ -304,7 +436,7 @@ class TagEditorWidget(QtWidgets.QWidget):
             return
 
         # Check if tag already exists
-        if tag in self._current_tags:
+        if tag in self._current_tags_set:
             QtWidgets.QMessageBox.information(
                 self,
                 "Tag Exists",
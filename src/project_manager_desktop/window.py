@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import functools
+import html as html_mod
+import importlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
@@ -9,13 +17,279 @@ from core.database import DatabaseManager
 from core.models import DocFile
 from integrations.registry import ToolRegistry
 from project_manager_cli.services.docs_discovery_service import DocsDiscoveryService
+from project_manager_cli.services.file_lock_service import FileLockService
 
 from .dialogs import ArchiveProjectDialog
-from .models import ProjectsFilterProxyModel, ProjectsTableModel
+from .dialogs.archive_dialog import delete_with_elevated_powershell
+from .models import DocsFilterProxyModel, DocsTableModel, ProjectsFilterProxyModel, ProjectsTableModel
 from .theme import TOKENS
 from .widgets import TagEditorWidget
 
 
+def _parse_tags(text: str) -> List[Any]:
+    """Parse tags stored as text: a JSON array, or plain comma-separated values."""
+    text = text.strip()
+    if not text:
+        return []
+    if text[0] == "[":
+        try:
+            value = json.loads(text)
+        except ValueError:
+            return []
+        return value if isinstance(value, list) else []
+    # Not JSON: skip json.loads and its exception path entirely.
+    return [t.strip() for t in text.split(",") if t.strip()]
+
+
+def _normalize_tags(raw: Any) -> tuple[List[str], str]:
+    """Return a project's tags as a list and as the comma-joined display string."""
+    if isinstance(raw, str):
+        raw = _parse_tags(raw)
+    tags = [str(t) for t in (raw or []) if t]
+    return tags, ", ".join(tags)
+
+
+# Dark-themed preview page (lighter, more readable theme). Formatted once at import;
+# renders only substitute the __PYGMENTS_CSS__ and __BODY__ placeholders.
+_PREVIEW_TEMPLATE = f"""\
+<html>
+<head>
+<style>
+    body {{
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+        margin: 0;
+        padding: 0;
+        color: {TOKENS.fg};
+        background: transparent;
+        line-height: 1.6;
+        font-size: 14px;
+    }}
+    .doc {{
+        padding: 16px;
+    }}
+    code {{
+        background-color: rgba(255,255,255,0.06);
+        color: {TOKENS.fg};
+        padding: 2px 6px;
+        border-radius: 6px;
+        font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+        font-size: 0.9em;
+    }}
+    pre {{
+        background-color: rgba(255,255,255,0.04);
+        color: {TOKENS.fg};
+        padding: 16px;
+        border-radius: 8px;
+        overflow-x: auto;
+        border: 1px solid {TOKENS.border};
+        line-height: 1.5;
+    }}
+    pre code {{
+        background-color: transparent;
+        color: inherit;
+        padding: 0;
+        font-size: 0.9em;
+    }}
+    table {{
+        border-collapse: collapse;
+        margin: 12px 0;
+        color: {TOKENS.fg};
+        width: 100%;
+    }}
+    th, td {{
+        border: 1px solid {TOKENS.border};
+        padding: 10px 12px;
+        text-align: left;
+    }}
+    th {{
+        background-color: rgba(255,255,255,0.04);
+        color: {TOKENS.fg};
+        font-weight: 600;
+    }}
+    a {{
+        color: {TOKENS.accent};
+        text-decoration: none;
+    }}
+    a:hover {{
+        color: {TOKENS.focus_ring};
+        text-decoration: underline;
+    }}
+    h1, h2, h3, h4, h5, h6 {{
+        color: {TOKENS.fg};
+        margin-top: 22px;
+        margin-bottom: 10px;
+        font-weight: 600;
+    }}
+    h1 {{
+        font-size: 24px;
+        border-bottom: 1px solid {TOKENS.border_subtle};
+        padding-bottom: 10px;
+    }}
+    h2 {{
+        font-size: 18px;
+        border-bottom: 1px solid {TOKENS.border_subtle};
+        padding-bottom: 8px;
+    }}
+    h3 {{ font-size: 15px; }}
+    h4 {{ font-size: 14px; color: {TOKENS.fg_muted}; }}
+    blockquote {{
+        border-left: 3px solid rgba(91, 140, 255, 0.55);
+        padding-left: 16px;
+        margin: 16px 0;
+        color: {TOKENS.fg_muted};
+    }}
+    ul, ol {{
+        color: {TOKENS.fg};
+        padding-left: 28px;
+    }}
+    li {{
+        margin: 6px 0;
+    }}
+    hr {{
+        border: none;
+        border-top: 1px solid {TOKENS.border_subtle};
+        margin: 24px 0;
+    }}
+    img {{
+        max-width: 100%;
+        height: auto;
+        border-radius: 8px;
+    }}
+    strong {{
+        color: {TOKENS.fg};
+        font-weight: 600;
+    }}
+    em {{
+        color: {TOKENS.fg_muted};
+    }}
+    __PYGMENTS_CSS__
+</style>
+</head>
+<body>
+<div class="doc">
+__BODY__
+</div>
+</body>
+</html>
+"""
+
+
+@dataclass(frozen=True)
+class _MarkdownCaps:
+    """Optional preview libraries present in this process, and the extensions they enable."""
+
+    has_markdown: bool
+    has_pygments: bool
+    has_pymdownx: bool
+    extensions: Tuple[str, ...]
+    extension_configs: Dict[str, Dict[str, Any]]
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_md_caps() -> _MarkdownCaps:
+    """Probe the optional imports once; a failed import is not cached by Python and would be retried per render."""
+    def _importable(name: str) -> bool:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            return False
+        return True
+
+    has_pygments = _importable("pygments")
+    has_pymdownx = _importable("pymdownx")
+
+    extensions = ['fenced_code', 'tables', 'nl2br']
+    extension_configs: Dict[str, Dict[str, Any]] = {}
+    # codehilite uses pygments for syntax highlighting
+    if has_pygments:
+        extensions.append('codehilite')
+        extension_configs['codehilite'] = {
+            'css_class': 'highlight',
+            'linenums': False
+        }
+    if has_pymdownx:
+        extensions.extend(['pymdownx.superfences', 'pymdownx.highlight'])
+
+    return _MarkdownCaps(
+        has_markdown=_importable("markdown"),
+        has_pygments=has_pygments,
+        has_pymdownx=has_pymdownx,
+        extensions=tuple(extensions),
+        extension_configs=extension_configs,
+    )
+
+
+# Previews format at most this much markdown (or this many ``` fences, i.e. half as many
+# code blocks); the rest is shown as plain text until the user asks for the full render.
+_PREVIEW_FORMAT_LIMIT = 32 * 1024
+_PREVIEW_MAX_FENCES = 40
+_PREVIEW_FULL_URL = "pm-preview:full"
+
+
+def _split_for_preview(content: str) -> tuple[str, str]:
+    """Split content into a head to format and a tail to show as plain text ("" if none)."""
+    limit = _PREVIEW_FORMAT_LIMIT
+    if content.count("```", 0, limit) > _PREVIEW_MAX_FENCES:
+        # Stop after the line holding the last allowed fence, which closes a code block.
+        pos = -3
+        for _ in range(_PREVIEW_MAX_FENCES):
+            pos = content.find("```", pos + 3)
+        end = content.find("\n", pos)
+        limit = len(content) if end == -1 else end + 1
+    elif len(content) > limit:
+        # Cut on a line boundary so the last formatted line is whole.
+        cut = content.rfind("\n", 0, limit)
+        if cut > 0:
+            limit = cut + 1
+    if len(content) <= limit:
+        return content, ""
+    return content[:limit], content[limit:]
+
+
+# Built on first preview and reused: constructing the renderer resolves every extension,
+# and the Pygments style sheet is the same for every document.
+_MD_RENDERER: Optional[Any] = None
+_MD_LOCK = threading.Lock()
+_PYGMENTS_CSS: Optional[str] = None
+
+
+def _get_md_renderer() -> Any:
+    """Return the shared markdown.Markdown instance (callers check _detect_md_caps().has_markdown)."""
+    global _MD_RENDERER
+    if _MD_RENDERER is None:
+        import markdown
+
+        caps = _detect_md_caps()
+        _MD_RENDERER = markdown.Markdown(extensions=list(caps.extensions), extension_configs=caps.extension_configs)
+    return _MD_RENDERER
+
+
+def _get_pygments_css() -> str:
+    """Return the Pygments style sheet for code blocks ("" without Pygments)."""
+    global _PYGMENTS_CSS
+    if _PYGMENTS_CSS is None:
+        _PYGMENTS_CSS = ""
+        if _detect_md_caps().has_pygments:
+            from pygments.formatters import HtmlFormatter
+            _PYGMENTS_CSS = HtmlFormatter(style='monokai').get_style_defs('.highlight')
+    return _PYGMENTS_CSS
+
+
+def _set_plain_text(edit: QtWidgets.QPlainTextEdit, text: str) -> None:
+    """setPlainText with change signals blocked, skipped when text is already shown.
+
+    Setting the text re-lays out the whole document, which is wasted on a no-op
+    (e.g. reselecting the current project after a save).
+    """
+    if edit.toPlainText() == text:
+        return
+    blocker = QtCore.QSignalBlocker(edit)
+    try:
+        edit.setPlainText(text)
+    finally:
+        blocker.unblock()
+
+
 class ProjectsTableDelegate(QtWidgets.QStyledItemDelegate):
     """Adds a restrained information hierarchy to the Projects table."""
 
@@ -42,12 +316,26 @@ class ProjectsTableDelegate(QtWidgets.QStyledItemDelegate):
 
 
 class MainWindow(QtWidgets.QMainWindow):
+    # Pool-thread results handed back to the GUI thread: (generation, payload, error).
+    _projects_loaded = QtCore.Signal(int, object, str)
+    _docs_loaded = QtCore.Signal(int, object, str)
+    _preview_ready = QtCore.Signal(int, object)
+    _delete_finished = QtCore.Signal(bool, str, str)
+
+    # Rendered doc previews kept for instant reselection.
+    PREVIEW_CACHE_SIZE = 64
+
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("Project Manager")
         self.resize(1200, 720)
 
         self.db = DatabaseManager(dynamic_config.SQLITE_DB_PATH)
+        try:
+            self._ensure_db()
+        except Exception as e:
+            # Queries reconnect lazily; the first failing action reports its own error.
+            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to open database:\n{e}")
         self.tools = ToolRegistry()
 
         self._projects_model = ProjectsTableModel([])
@@ -55,18 +343,43 @@ class MainWindow(QtWidgets.QMainWindow):
         self._proxy.setSourceModel(self._projects_model)
         self._proxy.setDynamicSortFilter(True)
 
+        self._docs_model = DocsTableModel()
+        self._docs_proxy = DocsFilterProxyModel()
+        self._docs_proxy.setSourceModel(self._docs_model)
+        # Selected doc, resolved once per selection change; a reset clears the selection silently.
+        self._selected_doc: Optional[DocFile] = None
+        self._docs_model.modelReset.connect(self._clear_selected_doc)
+
         self._current_project_uuid: Optional[str] = None
         self._dirty_notes = False
         self._dirty_edit = False
-        self._current_docs: List[DocFile] = []
+        # Rendered preview HTML keyed by (path, mtime_ns, size), least recently used first.
+        self._preview_cache: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        # Tag names for the editor's suggestions; None means reload on next use.
+        self._tags_cache: Optional[List[str]] = None
+
+        # Only the newest background load of each kind is applied.
+        self._projects_gen = 0
+        self._projects_select = (False, False)  # (select_first, reselect) for the pending load
+        self._docs_gen = 0
+        queued = QtCore.Qt.ConnectionType.QueuedConnection
+        self._projects_loaded.connect(self._on_projects_loaded, queued)
+        self._docs_loaded.connect(self._on_docs_loaded, queued)
+        self._preview_gen = 0
+        self._preview_ready.connect(self._on_preview_ready, queued)
+        self._delete_finished.connect(self._on_delete_finished, queued)
+        self._delete_progress: Optional[QtWidgets.QProgressDialog] = None
 
         self._build_ui()
+        self._sync_dirty_ui()
         self._connect_signals()
         self.refresh_projects(select_first=True)
 
     # ---------------- UI ----------------
     def _build_ui(self) -> None:
         central = QtWidgets.QWidget()
+        # Build the whole tree without intermediate repaints; re-enabled before it is installed.
+        central.setUpdatesEnabled(False)
         root_layout = QtWidgets.QVBoxLayout(central)
         root_layout.setContentsMargins(12, 12, 12, 12)
         root_layout.setSpacing(12)
@@ -215,12 +528,18 @@ class MainWindow(QtWidgets.QMainWindow):
         self.table.setAlternatingRowColors(True)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
         self.table.verticalHeader().setVisible(False)
-        self.table.horizontalHeader().setStretchLastSection(True)
-        self.table.horizontalHeader().setSectionResizeMode(ProjectsTableModel.COL_FAVORITE, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(ProjectsTableModel.COL_NAME, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(ProjectsTableModel.COL_PATH, QtWidgets.QHeaderView.ResizeMode.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(ProjectsTableModel.COL_TAGS, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(ProjectsTableModel.COL_UPDATED, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+        header = self.table.horizontalHeader()
+        header.setStretchLastSection(True)
+        # Fixed starting widths: ResizeToContents would measure every row on each model reset.
+        for col, width in (
+            (ProjectsTableModel.COL_FAVORITE, 32),
+            (ProjectsTableModel.COL_NAME, 220),
+            (ProjectsTableModel.COL_TAGS, 180),
+            (ProjectsTableModel.COL_UPDATED, 160),
+        ):
+            header.setSectionResizeMode(col, QtWidgets.QHeaderView.ResizeMode.Interactive)
+            header.resizeSection(col, width)
+        header.setSectionResizeMode(ProjectsTableModel.COL_PATH, QtWidgets.QHeaderView.ResizeMode.Stretch)
         self.table.setItemDelegate(ProjectsTableDelegate(self.table))
         self.table.setShowGrid(False)
 
@@ -296,9 +615,7 @@ class MainWindow(QtWidgets.QMainWindow):
         # Buttons
         edit_buttons = QtWidgets.QHBoxLayout()
         self.save_edit_btn = QtWidgets.QPushButton("Save Changes")
-        self.save_edit_btn.setEnabled(False)
         self.cancel_edit_btn = QtWidgets.QPushButton("Cancel")
-        self.cancel_edit_btn.setEnabled(False)
         edit_buttons.addWidget(self.save_edit_btn)
         edit_buttons.addWidget(self.cancel_edit_btn)
         edit_buttons.addStretch(1)
@@ -322,8 +639,35 @@ class MainWindow(QtWidgets.QMainWindow):
         notes_layout.addLayout(notes_actions)
         self.tabs.addTab(self.notes, "Notes")
 
-        # Tools tab
+        # Tools and Docs tabs are filled in on first activation (see _on_tab_changed).
         self.tools_tab = QtWidgets.QWidget()
+        self.tabs.addTab(self.tools_tab, "Tools")
+        self.docs_tab = QtWidgets.QWidget()
+        self.tabs.addTab(self.docs_tab, "Docs")
+        self._section_font = section_font
+        self._tab_builders: Dict[QtWidgets.QWidget, Callable[[], None]] = {
+            self.tools_tab: self._build_tools_tab,
+            self.docs_tab: self._build_docs_tab,
+        }
+
+        splitter.addWidget(right)
+        splitter.setStretchFactor(0, 2)
+        splitter.setStretchFactor(1, 3)
+
+        root_layout.addWidget(splitter, 1)
+        central.setUpdatesEnabled(True)
+        self.setCentralWidget(central)
+
+        # Status bar
+        self.status = self.statusBar()
+        self.status.showMessage("Ready")
+
+    def _on_tab_changed(self, index: int) -> None:
+        builder = self._tab_builders.pop(self.tabs.widget(index), None)
+        if builder is not None:
+            builder()
+
+    def _build_tools_tab(self) -> None:
         tools_layout = QtWidgets.QVBoxLayout(self.tools_tab)
         self.tools_list = QtWidgets.QListWidget()
         self.tools_list.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
@@ -331,10 +675,13 @@ class MainWindow(QtWidgets.QMainWindow):
         tools_layout.addWidget(self.tools_list, 1)
         self.open_tool_btn = QtWidgets.QPushButton("Open Selected Tool")
         tools_layout.addWidget(self.open_tool_btn)
-        self.tabs.addTab(self.tools_tab, "Tools")
+        self.open_tool_btn.clicked.connect(self.open_in_selected_tool)
+        self._reload_tools()
 
-        # Docs tab
-        self.docs_tab = QtWidgets.QWidget()
+    def _build_docs_tab(self) -> None:
+        # Resolved with the tab rather than at startup: probing imports markdown/pygments.
+        self._md_caps = _detect_md_caps()
+        self.docs_tab.setUpdatesEnabled(False)
         docs_layout = QtWidgets.QVBoxLayout(self.docs_tab)
         docs_layout.setSpacing(8)
 
@@ -367,12 +714,11 @@ class MainWindow(QtWidgets.QMainWindow):
         dl.setSpacing(10)
 
         docs_left_title = QtWidgets.QLabel("Documents")
-        docs_left_title.setFont(section_font)
+        docs_left_title.setFont(self._section_font)
         dl.addWidget(docs_left_title)
 
-        self.docs_table = QtWidgets.QTableWidget()
-        self.docs_table.setColumnCount(3)
-        self.docs_table.setHorizontalHeaderLabels(["Filename", "Path", "Modified"])
+        self.docs_table = QtWidgets.QTableView()
+        self.docs_table.setModel(self._docs_proxy)
         self.docs_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
         self.docs_table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
         self.docs_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
@@ -396,7 +742,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         preview_header = QtWidgets.QHBoxLayout()
         preview_title = QtWidgets.QLabel("Preview")
-        preview_title.setFont(section_font)
+        preview_title.setFont(self._section_font)
         preview_header.addWidget(preview_title)
         preview_header.addStretch(1)
         self.docs_preview_label = QtWidgets.QLabel("")
@@ -406,6 +752,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.docs_preview = QtWidgets.QTextBrowser()
         self.docs_preview.setOpenExternalLinks(False)
+        self.docs_preview.setOpenLinks(False)
+        self.docs_preview.anchorClicked.connect(self._on_docs_preview_link)
         pr.addWidget(self.docs_preview, 1)
 
         # Preview action bar
@@ -425,21 +773,15 @@ class MainWindow(QtWidgets.QMainWindow):
         docs_splitter.setStretchFactor(1, 3)
 
         docs_layout.addWidget(docs_splitter, 1)
-        self.tabs.addTab(self.docs_tab, "Docs")
-
-        splitter.addWidget(right)
-        splitter.setStretchFactor(0, 2)
-        splitter.setStretchFactor(1, 3)
-
-        root_layout.addWidget(splitter, 1)
-        self.setCentralWidget(central)
+        self.docs_tab.setUpdatesEnabled(True)
 
-        # Status bar
-        self.status = self.statusBar()
-        self.status.showMessage("Ready")
-
-        # Populate tools list
-        self._reload_tools()
+        # The proxy debounces keystrokes itself, like the projects filter.
+        self.docs_search.textChanged.connect(self._docs_proxy.set_query)
+        self.docs_refresh_btn.clicked.connect(self._on_docs_refresh)
+        self.docs_table.selectionModel().selectionChanged.connect(self._on_docs_selection_changed)
+        self.docs_open_cursor_btn.clicked.connect(self._on_docs_open_cursor)
+        self.docs_open_default_btn.clicked.connect(self._on_docs_open_default)
+        self._load_docs()
 
     def _connect_signals(self) -> None:
         self.search_input.textChanged.connect(self._on_search_changed)
@@ -464,46 +806,75 @@ class MainWindow(QtWidgets.QMainWindow):
         self.save_edit_btn.clicked.connect(self.save_edit)
         self.cancel_edit_btn.clicked.connect(self.cancel_edit)
 
-        self.docs_search.textChanged.connect(self._on_docs_search_changed)
-        self.docs_refresh_btn.clicked.connect(self._on_docs_refresh)
-        self.docs_table.itemSelectionChanged.connect(self._on_docs_selection_changed)
-        self.docs_open_cursor_btn.clicked.connect(self._on_docs_open_cursor)
-        self.docs_open_default_btn.clicked.connect(self._on_docs_open_default)
-
-        self.open_tool_btn.clicked.connect(self.open_in_selected_tool)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
     # ---------------- Data / actions ----------------
     def _ensure_db(self) -> None:
-        # Safe to call multiple times: connect() is idempotent-ish (stores conn).
+        # Called once at startup: every action shares this long-lived connection.
         self.db.connect()
         self.db.create_tables()
 
-    def refresh_projects(self, select_first: bool) -> None:
-        try:
-            self._ensure_db()
+    def refresh_projects(self, select_first: bool, reselect: bool = False) -> None:
+        """Reload the projects list on the thread pool; the table updates when it arrives."""
+        self._projects_gen += 1
+        generation = self._projects_gen
+        self._projects_select = (select_first, reselect)
+        archived = self.show_archived.isChecked()
+        db_path = self.db.db_path
+        QtCore.QThreadPool.globalInstance().start(
+            QtCore.QRunnable.create(lambda: self._fetch_projects(generation, db_path, archived))
+        )
 
-            # Check if showing archived projects
-            if self.show_archived.isChecked():
-                # Show all projects (enabled + archived)
-                projects = self.db.get_all_projects(enabled_only=False)
-                # Filter to only show archived
+    def _fetch_projects(self, generation: int, db_path: str, archived: bool) -> None:
+        """Worker-thread body: query projects on a private connection (sqlite3 connections are per-thread)."""
+        db = DatabaseManager(db_path)
+        try:
+            if archived:
+                # Show all projects (enabled + archived), filtered to only archived
+                projects = db.get_all_projects(enabled_only=False)
                 projects = [p for p in projects if p.get('archived', 0) == 1]
             else:
                 # Default: show only enabled, non-archived projects
-                projects = self.db.get_all_projects(enabled_only=True)
+                projects = db.get_all_projects(enabled_only=True)
+            result = (generation, projects, "")
+        except Exception as e:
+            result = (generation, None, str(e) or type(e).__name__)
+        finally:
+            db.close()
 
-            self._projects_model.set_projects(projects)
-            self._proxy.sort(ProjectsTableModel.COL_NAME, QtCore.Qt.SortOrder.AscendingOrder)
-            try:
-                self.projects_count.setText(f"({len(projects)})")
-            except Exception:
-                pass
-            self.status.showMessage(f"Loaded {len(projects)} projects", 2500)
+        try:
+            self._projects_loaded.emit(*result)
+        except RuntimeError:
+            # Window was destroyed before the load finished.
+            pass
 
-            if select_first and projects:
-                self.table.selectRow(0)
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load projects:\n{e}")
+    def _on_projects_loaded(self, generation: int, projects: Optional[List[Dict[str, Any]]], error: str) -> None:
+        if generation != self._projects_gen:
+            return
+        if projects is None:
+            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load projects:\n{error}")
+            return
+
+        # Bulk reload with sorting and repaints off, then sort exactly once.
+        self.table.setSortingEnabled(False)
+        self.table.setUpdatesEnabled(False)
+        self._proxy.setDynamicSortFilter(False)
+        try:
+            self._projects_model.set_projects(projects)
+        finally:
+            self._proxy.setDynamicSortFilter(True)
+            self.table.setSortingEnabled(True)
+            self.table.sortByColumn(ProjectsTableModel.COL_NAME, QtCore.Qt.SortOrder.AscendingOrder)
+            self.table.setUpdatesEnabled(True)
+
+        self.projects_count.setText(f"({len(projects)})")
+        self.status.showMessage(f"Loaded {len(projects)} projects", 2500)
+
+        select_first, reselect = self._projects_select
+        if select_first and projects:
+            self.table.selectRow(0)
+        elif reselect:
+            self._reselect_current_uuid()
 
     def _on_toolbar_refresh(self) -> None:
         """Handle toolbar refresh button - refresh projects and current tab content."""
@@ -540,74 +911,56 @@ class MainWindow(QtWidgets.QMainWindow):
             self.ov_updated.setText("")
             self.ov_open_count.setText("")
             self.ov_last_opened.setText("")
-            self.ov_desc.setPlainText("")
-            self.notes_edit.blockSignals(True)
-            self.notes_edit.setPlainText("")
-            self.notes_edit.blockSignals(False)
+            _set_plain_text(self.ov_desc, "")
+            _set_plain_text(self.notes_edit, "")
             self._dirty_notes = False
-            self.save_notes_btn.setEnabled(False)
-            self.revert_notes_btn.setEnabled(False)
+            self._sync_dirty_ui()
             return
 
         self._current_project_uuid = project.get("uuid")
         self.detail_title.setText(project.get("ai_app_name") or project.get("name") or "Unnamed project")
 
-        tags = project.get("tags") or []
-        if not isinstance(tags, str):
-            tags = ", ".join([str(t) for t in tags if t])
+        tags, tags_text = _normalize_tags(project.get("tags"))
 
         self.ov_uuid.setText(str(project.get("uuid") or ""))
         self.ov_path.setText(str(project.get("root_path") or ""))
-        self.ov_tags.setText(str(tags))
+        self.ov_tags.setText(tags_text)
         self.ov_updated.setText(str(project.get("last_updated") or ""))
         self.ov_open_count.setText(str(project.get("open_count") or 0))
         self.ov_last_opened.setText(str(project.get("last_opened") or ""))
-        self.ov_desc.setPlainText(str(project.get("description") or project.get("ai_app_description") or ""))
+        _set_plain_text(self.ov_desc, str(project.get("description") or project.get("ai_app_description") or ""))
 
-        self.notes_edit.blockSignals(True)
-        self.notes_edit.setPlainText(str(project.get("notes") or ""))
-        self.notes_edit.blockSignals(False)
+        _set_plain_text(self.notes_edit, str(project.get("notes") or ""))
         self._dirty_notes = False
-        self.save_notes_btn.setEnabled(False)
-        self.revert_notes_btn.setEnabled(False)
-
-        # Load Edit tab data
-        self.edit_name.blockSignals(True)
-        self.edit_desc.blockSignals(True)
-        self.edit_tags.blockSignals(True)
-
-        self.edit_name.setText(str(project.get("ai_app_name") or ""))
-        self.edit_desc.setPlainText(str(project.get("description") or project.get("ai_app_description") or ""))
-
-        # Load tags and available tags
-        try:
-            self._ensure_db()
-            all_tags = self.db.get_all_tags()
-            available_tag_names = [tag['name'] for tag in all_tags]
-            self.edit_tags.set_available_tags(available_tag_names)
-        except Exception:
-            self.edit_tags.set_available_tags([])
 
-        current_tags = project.get("tags", [])
-        if isinstance(current_tags, str):
-            import json
+        # Load available tags (queried once, until an edit invalidates the cache)
+        if self._tags_cache is None:
             try:
-                current_tags = json.loads(current_tags)
-            except json.JSONDecodeError:
-                current_tags = []
-        self.edit_tags.set_tags(current_tags)
+                self._tags_cache = [tag['name'] for tag in self.db.get_all_tags()]
+            except Exception:
+                pass
+        self.edit_tags.set_available_tags(self._tags_cache or [])
 
-        self.edit_name.blockSignals(False)
-        self.edit_desc.blockSignals(False)
-        self.edit_tags.blockSignals(False)
+        # Load Edit tab data
+        self._apply_edit_values(project, tags)
 
         self._dirty_edit = False
-        self.save_edit_btn.setEnabled(False)
-        self.cancel_edit_btn.setEnabled(False)
+        self._sync_dirty_ui()
 
         # Load Docs tab
         self._load_docs()
 
+    def _apply_edit_values(self, project: Dict[str, Any], tags: List[str]) -> None:
+        """Load the Edit tab fields from project without firing their change signals."""
+        blockers = [QtCore.QSignalBlocker(w) for w in (self.edit_name, self.edit_desc, self.edit_tags)]
+        try:
+            self.edit_name.setText(str(project.get("ai_app_name") or ""))
+            _set_plain_text(self.edit_desc, str(project.get("description") or project.get("ai_app_description") or ""))
+            self.edit_tags.set_tags(tags)
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
+
     def _maybe_confirm_discard_notes(self) -> bool:
         if self._dirty_notes:
             resp = QtWidgets.QMessageBox.question(
@@ -657,10 +1010,14 @@ class MainWindow(QtWidgets.QMainWindow):
             self._set_current_project(None)
             return
 
-        # Reload the full project record (ensures notes/fields are fresh)
+        # Model rows are full records (SELECT *) kept current by update_project;
+        # only fetch when a row lacks the payload.
+        if "notes" in project:
+            self._set_current_project(project)
+            return
         try:
-            self._ensure_db()
             full = self.db.get_project_by_uuid(project["uuid"])
+            self._projects_model.update_project(project["uuid"], full)
             self._set_current_project(full)
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load project:\n{e}")
@@ -670,45 +1027,53 @@ class MainWindow(QtWidgets.QMainWindow):
         uuid_ = self._current_project_uuid
         if not uuid_:
             return
-        for row in range(self._projects_model.rowCount()):
-            p = self._projects_model.project_at(row)
-            if p and p.get("uuid") == uuid_:
-                src = self._projects_model.index(row, 0)
-                proxy = self._proxy.mapFromSource(src)
-                if proxy.isValid():
-                    self.table.selectRow(proxy.row())
-                return
+        row = self._projects_model.row_for_uuid(uuid_)
+        if row is None:
+            return
+        proxy = self._proxy.mapFromSource(self._projects_model.index(row, 0))
+        if proxy.isValid():
+            self.table.selectRow(proxy.row())
+
+    def _sync_dirty_ui(self) -> None:
+        """Enable the save/revert buttons from the dirty flags, touching only buttons whose state changes."""
+        has_project = self._current_project_uuid is not None
+        want_notes = self._dirty_notes and has_project
+        want_edit = self._dirty_edit and has_project
+        for btn, want in (
+            (self.save_notes_btn, want_notes),
+            (self.revert_notes_btn, want_notes),
+            (self.save_edit_btn, want_edit),
+            (self.cancel_edit_btn, want_edit),
+        ):
+            if btn.isEnabled() != want:
+                btn.setEnabled(want)
 
     def _on_notes_changed(self) -> None:
         if not self._current_project_uuid:
             return
         self._dirty_notes = True
-        self.save_notes_btn.setEnabled(True)
-        self.revert_notes_btn.setEnabled(True)
+        self._sync_dirty_ui()
 
     def _on_edit_changed(self, *args) -> None:
         if not self._current_project_uuid:
             return
         self._dirty_edit = True
-        self.save_edit_btn.setEnabled(True)
-        self.cancel_edit_btn.setEnabled(True)
+        self._sync_dirty_ui()
 
     # ---------------- public actions ----------------
     def save_notes(self) -> None:
         if not self._current_project_uuid:
             return
         try:
-            self._ensure_db()
             text = self.notes_edit.toPlainText()
             self.db.update_notes(self._current_project_uuid, text)
             self._dirty_notes = False
-            self.save_notes_btn.setEnabled(False)
-            self.revert_notes_btn.setEnabled(False)
+            self._sync_dirty_ui()
             self.status.showMessage("Notes saved", 2000)
-            # Refresh the project record for updated timestamps
-            self._set_current_project(self._current_project())
-            self.refresh_projects(select_first=False)
-            self._reselect_current_uuid()
+            # Refresh the project record for updated timestamps; only its row changes.
+            project = self._current_project()
+            self._set_current_project(project)
+            self._projects_model.update_project(self._current_project_uuid, project)
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"Failed to save notes:\n{e}")
 
@@ -716,12 +1081,9 @@ class MainWindow(QtWidgets.QMainWindow):
         project = self._current_project()
         if not project:
             return
-        self.notes_edit.blockSignals(True)
-        self.notes_edit.setPlainText(str(project.get("notes") or ""))
-        self.notes_edit.blockSignals(False)
+        _set_plain_text(self.notes_edit, str(project.get("notes") or ""))
         self._dirty_notes = False
-        self.save_notes_btn.setEnabled(False)
-        self.revert_notes_btn.setEnabled(False)
+        self._sync_dirty_ui()
         self.status.showMessage("Reverted notes changes", 1500)
 
     def save_edit(self) -> None:
@@ -743,24 +1105,23 @@ class MainWindow(QtWidgets.QMainWindow):
         tags = self.edit_tags.get_tags()
 
         try:
-            self._ensure_db()
             # Update project fields
             self.db.update_project_fields(
                 self._current_project_uuid,
                 ai_app_name=name,
                 description=description,
-                tags=tags
+                tags=list(tags)
             )
 
             self._dirty_edit = False
-            self.save_edit_btn.setEnabled(False)
-            self.cancel_edit_btn.setEnabled(False)
+            self._sync_dirty_ui()
             self.status.showMessage("Project updated successfully", 2000)
+            self._tags_cache = None
 
-            # Refresh the project record and UI
-            self._set_current_project(self._current_project())
-            self.refresh_projects(select_first=False)
-            self._reselect_current_uuid()
+            # Refresh the project record and UI; only its row changes.
+            project = self._current_project()
+            self._set_current_project(project)
+            self._projects_model.update_project(self._current_project_uuid, project)
 
         except Exception as e:
             QtWidgets.QMessageBox.critical(
@@ -775,298 +1136,192 @@ class MainWindow(QtWidgets.QMainWindow):
         if not project:
             return
 
-        self.edit_name.blockSignals(True)
-        self.edit_desc.blockSignals(True)
-        self.edit_tags.blockSignals(True)
-
-        self.edit_name.setText(str(project.get("ai_app_name") or ""))
-        self.edit_desc.setPlainText(str(project.get("description") or project.get("ai_app_description") or ""))
-
-        # Reload tags
-        current_tags = project.get("tags", [])
-        if isinstance(current_tags, str):
-            import json
-            try:
-                current_tags = json.loads(current_tags)
-            except json.JSONDecodeError:
-                current_tags = []
-        self.edit_tags.set_tags(current_tags)
-
-        self.edit_name.blockSignals(False)
-        self.edit_desc.blockSignals(False)
-        self.edit_tags.blockSignals(False)
+        tags, _ = _normalize_tags(project.get("tags"))
+        self._apply_edit_values(project, tags)
 
         self._dirty_edit = False
-        self.save_edit_btn.setEnabled(False)
-        self.cancel_edit_btn.setEnabled(False)
+        self._sync_dirty_ui()
         self.status.showMessage("Reverted edit changes", 1500)
 
     # ---------------- Docs tab methods ----------------
     def _load_docs(self) -> None:
-        """Load documentation files for the current project."""
+        """Discover documentation files for the current project on the thread pool."""
+        self._docs_gen += 1
+        self._preview_gen += 1  # a preview still rendering belongs to the old list
+        if self.docs_tab in self._tab_builders:
+            # Docs tab not built yet; it loads when first shown.
+            return
         project = self._current_project()
         if not project:
-            self._current_docs = []
-            self._populate_docs_table([])
+            self._docs_model.set_docs([])
             self.docs_preview.clear()
             self.docs_preview_label.setText("")
             return
 
+        generation = self._docs_gen
+        root_path = project.get("root_path", "")
+        QtCore.QThreadPool.globalInstance().start(
+            QtCore.QRunnable.create(lambda: self._discover_docs(generation, root_path))
+        )
+
+    def _discover_docs(self, generation: int, root_path: str) -> None:
+        """Worker-thread body: walk the project tree for docs."""
         try:
-            root_path = project.get("root_path", "")
-            self._current_docs = DocsDiscoveryService.discover_docs(root_path)
-            self._populate_docs_table(self._current_docs)
+            result = (generation, DocsDiscoveryService.discover_docs(root_path), "")
+        except Exception as e:
+            result = (generation, None, str(e) or type(e).__name__)
 
-            if self._current_docs:
-                self.status.showMessage(f"Found {len(self._current_docs)} documentation files", 2000)
-            else:
-                self.docs_preview.setHtml(
-                    f"<p style='color: {TOKENS.fg_muted}; font-style: italic;'>No documentation files found in this project.</p>"
-                )
-                self.docs_preview_label.setText("")
+        try:
+            self._docs_loaded.emit(*result)
+        except RuntimeError:
+            # Window was destroyed before discovery finished.
+            pass
 
-        except Exception as e:
-            self._current_docs = []
-            self._populate_docs_table([])
-            QtWidgets.QMessageBox.warning(self, "Error", f"Failed to discover docs:\n{e}")
-
-    def _populate_docs_table(self, docs: List[DocFile]) -> None:
-        """Populate the docs table with documentation files."""
-        self.docs_table.setRowCount(0)
-        self.docs_table.setRowCount(len(docs))
-
-        for row, doc in enumerate(docs):
-            # Filename
-            filename_item = QtWidgets.QTableWidgetItem(doc.filename)
-            filename_item.setData(QtCore.Qt.ItemDataRole.UserRole, row)  # Store index
-            self.docs_table.setItem(row, 0, filename_item)
-
-            # Relative path
-            path_item = QtWidgets.QTableWidgetItem(doc.relative_path)
-            self.docs_table.setItem(row, 1, path_item)
-
-            # Modified date
-            modified_str = doc.modified_date.strftime("%Y-%m-%d %H:%M")
-            modified_item = QtWidgets.QTableWidgetItem(modified_str)
-            self.docs_table.setItem(row, 2, modified_item)
+    def _on_docs_loaded(self, generation: int, docs: Optional[List[DocFile]], error: str) -> None:
+        if generation != self._docs_gen:
+            return
+        if docs is None:
+            self._docs_model.set_docs([])
+            QtWidgets.QMessageBox.warning(self, "Error", f"Failed to discover docs:\n{error}")
+            return
+
+        self._docs_model.set_docs(docs)
+
+        if docs:
+            self.status.showMessage(f"Found {len(docs)} documentation files", 2000)
+        else:
+            self.docs_preview.setHtml(
+                f"<p style='color: {TOKENS.fg_muted}; font-style: italic;'>No documentation files found in this project.</p>"
+            )
+            self.docs_preview_label.setText("")
 
     def _on_docs_refresh(self) -> None:
         """Refresh the docs list."""
         self._load_docs()
         self.docs_search.clear()
+        self._docs_proxy.flush_query()
 
-    def _on_docs_search_changed(self, query: str) -> None:
-        """Filter docs table based on search query."""
-        query_lower = query.lower()
-
-        for row in range(self.docs_table.rowCount()):
-            filename_item = self.docs_table.item(row, 0)
-            path_item = self.docs_table.item(row, 1)
-
-            if not query_lower:
-                self.docs_table.setRowHidden(row, False)
-            else:
-                filename = filename_item.text().lower() if filename_item else ""
-                path = path_item.text().lower() if path_item else ""
-                match = query_lower in filename or query_lower in path
-                self.docs_table.setRowHidden(row, not match)
-
-    def _on_docs_selection_changed(self) -> None:
+    def _on_docs_selection_changed(self, *_args) -> None:
         """Handle docs table selection change."""
-        doc = self._get_selected_doc()
+        doc = self._selected_doc = self._get_selected_doc()
         if not doc:
+            self._preview_gen += 1  # drop any render still in flight
             self.docs_preview.clear()
             self.docs_preview_label.setText("")
             return
 
         self._render_markdown_preview(doc)
 
-    def _render_markdown_preview(self, doc: DocFile) -> None:
-        """Render markdown file preview."""
-        try:
-            # Show context (muted) while keeping the "Preview" title stable.
-            self.docs_preview_label.setText(doc.relative_path)
-
-            # Read file content (limit to 100KB)
-            max_size = 100 * 1024  # 100KB
-            if doc.size_bytes > max_size:
-                with open(doc.full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read(max_size)
-                content += "\n\n... (file truncated)"
-            else:
-                with open(doc.full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+    def _render_markdown_preview(self, doc: DocFile, full: bool = False) -> None:
+        """Show a doc's preview: from the cache, else rendered on the thread pool."""
+        self._preview_gen += 1
+        generation = self._preview_gen
 
-            # Try to render as markdown, fallback to plain text
+        # Show context (muted) while keeping the "Preview" title stable.
+        self.docs_preview_label.setText(doc.relative_path)
+
+        # Fresh stat, so a doc edited since discovery is re-rendered.
+        # Full renders of large docs are on demand and not cached.
+        cache_key: Optional[tuple[str, int, int]] = None
+        if not full:
             try:
-                import markdown
-
-                # Configure extensions
-                extensions = ['fenced_code', 'tables', 'nl2br']
-                extension_configs = {}
-
-                # Try to use codehilite with pygments for syntax highlighting
-                try:
-                    import pygments
-                    extensions.append('codehilite')
-                    extension_configs['codehilite'] = {
-                        'css_class': 'highlight',
-                        'linenums': False
-                    }
-                except ImportError:
-                    pass
-
-                # Try to use pymdown extensions
-                try:
-                    import pymdownx
-                    extensions.extend(['pymdownx.superfences', 'pymdownx.highlight'])
-                except ImportError:
-                    pass
-
-                html = markdown.markdown(
-                    content,
-                    extensions=extensions,
-                    extension_configs=extension_configs
-                )
+                st = os.stat(doc.full_path)
+                cache_key = (str(doc.full_path), st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+        cached = self._preview_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            self._preview_cache.move_to_end(cache_key)
+            self.docs_preview.setHtml(cached)
+            return
 
-                # Generate pygments CSS if available
-                pygments_css = ""
-                try:
-                    from pygments.formatters import HtmlFormatter
-                    formatter = HtmlFormatter(style='monokai')
-                    pygments_css = formatter.get_style_defs('.highlight')
-                except ImportError:
-                    pass
-
-                # Wrap in dark-themed HTML with styling (lighter, more readable theme)
-                styled_html = f"""
-                <html>
-                <head>
-                <style>
-                    body {{
-                        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
-                        margin: 0;
-                        padding: 0;
-                        color: {TOKENS.fg};
-                        background: transparent;
-                        line-height: 1.6;
-                        font-size: 14px;
-                    }}
-                    .doc {{
-                        padding: 16px;
-                    }}
-                    code {{
-                        background-color: rgba(255,255,255,0.06);
-                        color: {TOKENS.fg};
-                        padding: 2px 6px;
-                        border-radius: 6px;
-                        font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
-                        font-size: 0.9em;
-                    }}
-                    pre {{
-                        background-color: rgba(255,255,255,0.04);
-                        color: {TOKENS.fg};
-                        padding: 16px;
-                        border-radius: 8px;
-                        overflow-x: auto;
-                        border: 1px solid {TOKENS.border};
-                        line-height: 1.5;
-                    }}
-                    pre code {{
-                        background-color: transparent;
-                        color: inherit;
-                        padding: 0;
-                        font-size: 0.9em;
-                    }}
-                    table {{
-                        border-collapse: collapse;
-                        margin: 12px 0;
-                        color: {TOKENS.fg};
-                        width: 100%;
-                    }}
-                    th, td {{
-                        border: 1px solid {TOKENS.border};
-                        padding: 10px 12px;
-                        text-align: left;
-                    }}
-                    th {{
-                        background-color: rgba(255,255,255,0.04);
-                        color: {TOKENS.fg};
-                        font-weight: 600;
-                    }}
-                    a {{
-                        color: {TOKENS.accent};
-                        text-decoration: none;
-                    }}
-                    a:hover {{
-                        color: {TOKENS.focus_ring};
-                        text-decoration: underline;
-                    }}
-                    h1, h2, h3, h4, h5, h6 {{
-                        color: {TOKENS.fg};
-                        margin-top: 22px;
-                        margin-bottom: 10px;
-                        font-weight: 600;
-                    }}
-                    h1 {{
-                        font-size: 24px;
-                        border-bottom: 1px solid {TOKENS.border_subtle};
-                        padding-bottom: 10px;
-                    }}
-                    h2 {{
-                        font-size: 18px;
-                        border-bottom: 1px solid {TOKENS.border_subtle};
-                        padding-bottom: 8px;
-                    }}
-                    h3 {{ font-size: 15px; }}
-                    h4 {{ font-size: 14px; color: {TOKENS.fg_muted}; }}
-                    blockquote {{
-                        border-left: 3px solid rgba(91, 140, 255, 0.55);
-                        padding-left: 16px;
-                        margin: 16px 0;
-                        color: {TOKENS.fg_muted};
-                    }}
-                    ul, ol {{
-                        color: {TOKENS.fg};
-                        padding-left: 28px;
-                    }}
-                    li {{
-                        margin: 6px 0;
-                    }}
-                    hr {{
-                        border: none;
-                        border-top: 1px solid {TOKENS.border_subtle};
-                        margin: 24px 0;
-                    }}
-                    img {{
-                        max-width: 100%;
-                        height: auto;
-                        border-radius: 8px;
-                    }}
-                    strong {{
-                        color: {TOKENS.fg};
-                        font-weight: 600;
-                    }}
-                    em {{
-                        color: {TOKENS.fg_muted};
-                    }}
-                    {pygments_css}
-                </style>
-                </head>
-                <body>
-                <div class="doc">
-                {html}
-                </div>
-                </body>
-                </html>
-                """
-                self.docs_preview.setHtml(styled_html)
-            except ImportError:
-                # Fallback to plain text if markdown library not available
-                self.docs_preview.setPlainText(content)
+        has_markdown = self._md_caps.has_markdown
+        QtCore.QThreadPool.globalInstance().start(
+            QtCore.QRunnable.create(lambda: self._render_preview_worker(generation, doc, cache_key, has_markdown, full))
+        )
 
+    def _render_preview_worker(
+        self,
+        generation: int,
+        doc: DocFile,
+        cache_key: Optional[tuple[str, int, int]],
+        has_markdown: bool,
+        full: bool,
+    ) -> None:
+        """Worker-thread body: read and render the doc, then hand the result to the GUI thread."""
+        try:
+            is_html, text = self._render_preview_content(doc, has_markdown, full)
+            result = (cache_key, is_html, text)
         except Exception as e:
-            self.docs_preview.setHtml(f"<p style='color: red;'>Error reading file: {e}</p>")
+            result = (None, True, f"<p style='color: red;'>Error reading file: {html_mod.escape(str(e))}</p>")
+
+        try:
+            self._preview_ready.emit(generation, result)
+        except RuntimeError:
+            # Window was destroyed before the render finished.
+            pass
+
+    @staticmethod
+    def _render_preview_content(doc: DocFile, has_markdown: bool, full: bool = False) -> tuple[bool, str]:
+        """
+        Return (is_html, text) for a doc: styled HTML, or plain text without markdown.
+
+        Unless full is set, large or code-heavy docs only have their head formatted;
+        the remainder follows as escaped plain text with a link to format everything.
+        """
+        # Read file content (limit to 100KB): one bounded binary read, one decode.
+        max_size = 100 * 1024  # 100KB
+        with open(doc.full_path, 'rb') as f:
+            raw = f.read(max_size + 1)
+        content = raw[:max_size].decode('utf-8', errors='ignore').replace('\r\n', '\n')
+        if len(raw) > max_size:
+            content += "\n\n... (file truncated)"
+
+        # Fallback to plain text if markdown library not available
+        if not has_markdown:
+            return False, content
+
+        head, tail = (content, "") if full else _split_for_preview(content)
+
+        # The shared renderer is stateful; renders may overlap on the pool.
+        with _MD_LOCK:
+            html = _get_md_renderer().reset().convert(head)
+
+        if tail:
+            html += (
+                f"<hr><p style='color: {TOKENS.fg_muted};'>Large document: the rest is shown unformatted. "
+                f"<a href='{_PREVIEW_FULL_URL}'>Show full formatted preview</a></p>"
+                f"<pre>{html_mod.escape(tail)}</pre>"
+            )
+
+        # Wrap in dark-themed HTML with styling
+        return True, _PREVIEW_TEMPLATE.replace("__PYGMENTS_CSS__", _get_pygments_css()).replace("__BODY__", html)
+
+    def _on_docs_preview_link(self, url: QtCore.QUrl) -> None:
+        if url.toString() == _PREVIEW_FULL_URL:
+            doc = self._selected_doc
+            if doc:
+                self._render_markdown_preview(doc, full=True)
+            return
+        # Any other link: navigate in place, as the browser did before links were intercepted.
+        self.docs_preview.setSource(url)
+
+    def _on_preview_ready(self, generation: int, result: tuple) -> None:
+        if generation != self._preview_gen:
+            return
+        cache_key, is_html, text = result
+        if not is_html:
+            self.docs_preview.setPlainText(text)
+            return
+
+        self.docs_preview.setHtml(text)
+        if cache_key:
+            self._preview_cache[cache_key] = text
+            if len(self._preview_cache) > self.PREVIEW_CACHE_SIZE:
+                self._preview_cache.popitem(last=False)
+
+    def _clear_selected_doc(self) -> None:
+        self._selected_doc = None
 
     def _get_selected_doc(self) -> Optional[DocFile]:
         """Get the currently selected documentation file."""
@@ -1074,24 +1329,12 @@ class MainWindow(QtWidgets.QMainWindow):
         if not selected_rows:
             return None
 
-        row = selected_rows[0].row()
-        if row < 0 or row >= len(self._current_docs):
-            return None
-
-        # Get the doc index from the first column's UserRole
-        filename_item = self.docs_table.item(row, 0)
-        if not filename_item:
-            return None
-
-        doc_index = filename_item.data(QtCore.Qt.ItemDataRole.UserRole)
-        if doc_index is None or doc_index >= len(self._current_docs):
-            return None
-
-        return self._current_docs[doc_index]
+        src_index = self._docs_proxy.mapToSource(selected_rows[0])
+        return self._docs_model.doc_at(src_index.row())
 
     def _on_docs_open_cursor(self) -> None:
         """Open selected doc file in Cursor."""
-        doc = self._get_selected_doc()
+        doc = self._selected_doc
         if not doc:
             QtWidgets.QMessageBox.information(self, "No Selection", "Please select a file first.")
             return
@@ -1124,7 +1367,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _on_docs_open_default(self) -> None:
         """Open selected doc file in default editor."""
-        doc = self._get_selected_doc()
+        doc = self._selected_doc
         if not doc:
             QtWidgets.QMessageBox.information(self, "No Selection", "Please select a file first.")
             return
@@ -1155,11 +1398,9 @@ class MainWindow(QtWidgets.QMainWindow):
         if not self._current_project_uuid:
             return
         try:
-            self._ensure_db()
             new_state = self.db.toggle_favorite(self._current_project_uuid)
             self.status.showMessage("Favorited" if new_state else "Unfavorited", 1500)
-            self.refresh_projects(select_first=False)
-            self._reselect_current_uuid()
+            self.refresh_projects(select_first=False, reselect=True)
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"Failed to toggle favorite:\n{e}")
 
@@ -1282,7 +1523,6 @@ class MainWindow(QtWidgets.QMainWindow):
             return
 
         try:
-            self._ensure_db()
 
             # Check if hard delete was requested
             if hard_delete_checkbox.isChecked():
@@ -1294,18 +1534,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
             # Check if physical file deletion was requested
             if delete_files_checkbox.isChecked() and project_path:
-                self.status.showMessage(f"Deleting project files from disk...", 1000)
-                QtWidgets.QApplication.processEvents()  # Update UI
-
-                if self._delete_project_directory(project_path):
-                    self.status.showMessage(f"Deleted {project_name} and all files", 3000)
-                else:
-                    QtWidgets.QMessageBox.warning(
-                        self,
-                        "Partial Success",
-                        f"Project removed from database but failed to delete some/all files.\n\n"
-                        f"You may need to manually delete:\n{project_path}"
-                    )
+                # Runs in the background; _on_delete_finished reports the outcome.
+                self._delete_project_directory(project_path, project_name)
 
             # Clear current project
             self._current_project_uuid = None
@@ -1362,32 +1592,63 @@ class MainWindow(QtWidgets.QMainWindow):
         """Handle show archived toggle."""
         self.refresh_projects(select_first=False)
 
-    def _delete_project_directory(self, project_path: str) -> bool:
+    def _delete_project_directory(self, project_path: str, project_name: str) -> None:
         """
-        Delete project directory using PowerShell with handle cleanup.
+        Delete project directory in-process on the thread pool, without blocking the UI.
+
+        A modal progress dialog is shown while the worker runs; _on_delete_finished
+        reports the result.
 
         Args:
             project_path: Full path to project directory to delete
-
-        Returns:
-            True if successful, False otherwise
+            project_name: Display name for status messages
         """
-        import subprocess
+        progress = QtWidgets.QProgressDialog(f"Deleting project files for {project_name}...", "", 0, 0, self)
+        progress.setWindowTitle("Deleting")
+        progress.setCancelButton(None)
+        progress.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        # One delete at a time (the dialog is modal); closed by _on_delete_finished.
+        self._delete_progress = progress
+
+        self.status.showMessage("Deleting project files from disk...")
+        progress.show()
+        QtCore.QThreadPool.globalInstance().start(
+            QtCore.QRunnable.create(lambda: self._delete_directory_worker(project_path, project_name))
+        )
 
-        # PowerShell command to kill processes holding handles and delete directory
-        ps_command = f'''$path="{project_path}"; if(Test-Path -LiteralPath $path){{ $pids=(& handle.exe -accepteula -nobanner $path 2>$null | % {{ if($_ -match '\\spid:\\s+(\\d+)\\s'){{ [int]$matches[1] }} }} | sort -Unique); if($pids){{ Stop-Process -Id $pids -Force -ErrorAction SilentlyContinue }}; try{{ Remove-Item -LiteralPath $path -Recurse -Force -ErrorAction Stop }} catch {{ takeown /F $path /R /D Y | Out-Null; icacls $path /grant "$env:USERNAME:(OI)(CI)F" /T /C | Out-Null; Remove-Item -LiteralPath $path -Recurse -Force }} }}'''
+    def _delete_directory_worker(self, project_path: str, project_name: str) -> None:
+        """Worker-thread body: delete the tree, then hand the outcome to the GUI thread."""
+        try:
+            # Same strategy as archiving: native delete, then Restart Manager, then elevated.
+            ok = FileLockService.delete_locked_tree(
+                project_path,
+                fallback=lambda: delete_with_elevated_powershell(project_path, log=lambda _msg: None),
+            )
+        except Exception:
+            ok = False
 
         try:
-            result = subprocess.run(
-                ['powershell', '-Command', ps_command],
-                capture_output=True,
-                text=True,
-                timeout=60  # 60 second timeout for large directories
+            self._delete_finished.emit(ok, project_name, project_path)
+        except RuntimeError:
+            # Window was destroyed before the delete finished.
+            pass
+
+    def _on_delete_finished(self, ok: bool, project_name: str, project_path: str) -> None:
+        if self._delete_progress is not None:
+            self._delete_progress.close()
+            self._delete_progress.deleteLater()
+            self._delete_progress = None
+        if ok:
+            self.status.showMessage(f"Deleted {project_name} and all files", 3000)
+        else:
+            self.status.clearMessage()
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Partial Success",
+                f"Project removed from database but failed to delete some/all files.\n\n"
+                f"You may need to manually delete:\n{project_path}"
             )
-            return result.returncode == 0
-        except Exception as e:
-            self.status.showMessage(f"Error deleting directory: {e}", 3000)
-            return False
 
     def open_in_default_tool(self) -> None:
         project = self._current_project()
@@ -1403,8 +1664,9 @@ class MainWindow(QtWidgets.QMainWindow):
         ok = self.tools.open_project(default_tool.name, path)
         if ok:
             try:
-                self._ensure_db()
                 self.db.record_project_open(project["uuid"])
+                # Keep the cached row current; selection reads from it.
+                self._projects_model.update_project(project["uuid"], self.db.get_project_by_uuid(project["uuid"]))
             except Exception:
                 pass
             self.status.showMessage(f"Opened in {default_tool.display_name}", 2000)
@@ -1424,8 +1686,9 @@ class MainWindow(QtWidgets.QMainWindow):
         ok = self.tools.open_project(str(tool_name), path)
         if ok:
             try:
-                self._ensure_db()
                 self.db.record_project_open(project["uuid"])
+                # Keep the cached row current; selection reads from it.
+                self._projects_model.update_project(project["uuid"], self.db.get_project_by_uuid(project["uuid"]))
             except Exception:
                 pass
             self.status.showMessage(f"Opened in {item.text()}", 2000)
@@ -0,0 +1,59 @@
+"""Tests for DatabaseManager."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.database import DatabaseManager
+
+
+def _make_db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    db.connect()
+    db.create_tables()
+    # Migrations (e.g. the archived column) run on connect once the tables exist.
+    db.close()
+    db.connect()
+    db.add_or_update_project({
+        "uuid": "p1",
+        "name": "demo",
+        "root_path": str(tmp_path / "demo"),
+        "tags": ["python"],
+        "enabled": 1,
+    })
+    return db
+
+
+def test_update_project_fields_accepts_tag_tuple(tmp_path):
+    db = _make_db(tmp_path)
+    try:
+        # The tag editor's get_tags() returns a tuple snapshot.
+        assert db.update_project_fields("p1", ai_app_name="Demo", tags=("python", "cli"))
+        project = db.get_project_by_uuid("p1")
+        assert project["ai_app_name"] == "Demo"
+        assert project["tags"] == ["python", "cli"]
+    finally:
+        db.close()
+
+
+def test_update_project_fields_accepts_tag_list(tmp_path):
+    db = _make_db(tmp_path)
+    try:
+        assert db.update_project_fields("p1", tags=["web"])
+        assert db.get_project_by_uuid("p1")["tags"] == ["web"]
+    finally:
+        db.close()
+
+
+def test_count_projects_drops_after_hard_delete(tmp_path):
+    db = _make_db(tmp_path)
+    try:
+        before = db.max_last_updated()
+        assert db.count_projects() == 1
+        db.hard_delete_project("p1")
+        # MAX(last_updated) can't reveal a purge; the count does.
+        assert db.max_last_updated() in (before, None)
+        assert db.count_projects() == 0
+    finally:
+        db.close()